@@ -0,0 +1,252 @@
+"""Redis-cached admin dashboard snapshot (stale-while-revalidate)."""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.api.admin.schema import DashboardStatsResponse
+from app.config import CONFIG_SETTINGS
+from app.database.redis import get_redis
+from app.models.main.categories import TblCategories
+from app.models.main.food import TblFoods
+from app.models.main.orders import TblOrders
+from app.models.main.restaurants import TblRestaurants
+from app.models.main.users import TblUsers
+
+logger = logging.getLogger(__name__)
+
+# Writes to these tables change what the dashboard shows
+WATCHED_MODELS = (TblOrders, TblUsers, TblRestaurants, TblCategories, TblFoods)
+WATCHED_TABLES = {model.__table__.fullname for model in WATCHED_MODELS}
+
+
+# Stores a computed snapshot. It is marked fresh only if no write has
+# invalidated the cache (bumped the generation) since the computation
+# started; otherwise it is kept, but as stale, and the next read refreshes.
+#   KEYS: snapshot, fresh, generation
+#   ARGV: snapshot json, snapshot ttl, fresh ttl, generation seen at start
+STORE_SNAPSHOT_LUA = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+if (redis.call('GET', KEYS[3]) or '0') == ARGV[4] then
+    redis.call('SET', KEYS[2], '1', 'EX', ARGV[3])
+end
+"""
+
+# Releases the refresh lock only if it is still held by this refresher
+#   KEYS: lock; ARGV: token
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# How often a cold read rechecks for the snapshot another worker computes
+_COLD_POLL_SECONDS = 0.1
+
+
+class DashboardCache:
+    """Keeps the last `DashboardStatsResponse` in Redis.
+
+    The snapshot is served while it is younger than
+    `DASHBOARD_CACHE_FRESH_SECONDS`. After that (or once a write marks it
+    stale) it is still served, up to `DASHBOARD_CACHE_MAX_STALE_SECONDS`,
+    while a single background task recomputes it; the refresh lock makes
+    sure only one worker does so at a time. With no snapshot at all, the
+    lock holder computes it and the other readers wait for it.
+    """
+
+    SNAPSHOT_KEY = "dashboard:snapshot"
+    FRESH_KEY = "dashboard:fresh"
+    GENERATION_KEY = "dashboard:generation"
+    LOCK_KEY = "dashboard:refresh_lock"
+
+    def __init__(self):
+        self._tasks: set[asyncio.Task] = set()
+        self._store_script = None
+        self._release_script = None
+
+    @property
+    def redis(self) -> Redis:
+        return get_redis()
+
+    async def get(
+        self, compute: Callable[[], Awaitable[DashboardStatsResponse]]
+    ) -> DashboardStatsResponse:
+        try:
+            snapshot, fresh = await self.redis.mget(self.SNAPSHOT_KEY, self.FRESH_KEY)
+        except RedisError:
+            logger.warning("Dashboard cache unavailable, computing directly")
+            return self._with_age(await compute())
+
+        if snapshot is None:
+            return self._with_age(await self._get_cold(compute))
+
+        if fresh is None:
+            await self._refresh_in_background(compute)
+        return self._with_age(DashboardStatsResponse.model_validate_json(snapshot))
+
+    async def invalidate(self) -> None:
+        """Mark the snapshot stale; the next read triggers a refresh."""
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.incr(self.GENERATION_KEY)
+                pipe.delete(self.FRESH_KEY)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Dashboard cache invalidation failed")
+
+    def invalidate_soon(self) -> None:
+        self._spawn(self.invalidate())
+
+    async def _get_cold(
+        self, compute: Callable[[], Awaitable[DashboardStatsResponse]]
+    ) -> DashboardStatsResponse:
+        """No snapshot: compute it under the refresh lock, or wait for the
+        worker holding the lock to store it."""
+        deadline = (
+            asyncio.get_running_loop().time()
+            + CONFIG_SETTINGS.DASHBOARD_CACHE_LOCK_SECONDS
+        )
+        while True:
+            token = await self._acquire_lock()
+            if token is not None:
+                try:
+                    return await self._compute_and_store(compute)
+                finally:
+                    await self._release_lock(token)
+
+            await asyncio.sleep(_COLD_POLL_SECONDS)
+            try:
+                snapshot = await self.redis.get(self.SNAPSHOT_KEY)
+            except RedisError:
+                snapshot = None
+            if snapshot is not None:
+                return DashboardStatsResponse.model_validate_json(snapshot)
+            if asyncio.get_running_loop().time() >= deadline:
+                logger.warning("Dashboard snapshot not ready, computing directly")
+                return await compute()
+
+    async def _acquire_lock(self) -> str | None:
+        """Token of the refresh lock if acquired, else None."""
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.set(
+                self.LOCK_KEY,
+                token,
+                nx=True,
+                ex=CONFIG_SETTINGS.DASHBOARD_CACHE_LOCK_SECONDS,
+            )
+        except RedisError:
+            return None
+        return token if acquired else None
+
+    async def _release_lock(self, token: str) -> None:
+        if self._release_script is None:
+            self._release_script = self.redis.register_script(RELEASE_LOCK_LUA)
+        try:
+            await self._release_script(keys=[self.LOCK_KEY], args=[token])
+        except RedisError:
+            pass
+
+    async def _refresh_in_background(
+        self, compute: Callable[[], Awaitable[DashboardStatsResponse]]
+    ) -> None:
+        token = await self._acquire_lock()
+        if token is not None:
+            self._spawn(self._refresh(compute, token))
+
+    async def _refresh(
+        self, compute: Callable[[], Awaitable[DashboardStatsResponse]], token: str
+    ) -> None:
+        try:
+            await self._compute_and_store(compute)
+        except Exception:
+            logger.exception("Dashboard snapshot refresh failed")
+        finally:
+            await self._release_lock(token)
+
+    async def _compute_and_store(
+        self, compute: Callable[[], Awaitable[DashboardStatsResponse]]
+    ) -> DashboardStatsResponse:
+        try:
+            generation = await self.redis.get(self.GENERATION_KEY) or "0"
+        except RedisError:
+            generation = None
+        stats = await compute()
+        if generation is not None:
+            await self._store(stats, generation)
+        return stats
+
+    async def _store(self, stats: DashboardStatsResponse, generation: str) -> None:
+        if self._store_script is None:
+            self._store_script = self.redis.register_script(STORE_SNAPSHOT_LUA)
+        try:
+            await self._store_script(
+                keys=[self.SNAPSHOT_KEY, self.FRESH_KEY, self.GENERATION_KEY],
+                args=[
+                    stats.model_dump_json(),
+                    CONFIG_SETTINGS.DASHBOARD_CACHE_MAX_STALE_SECONDS,
+                    CONFIG_SETTINGS.DASHBOARD_CACHE_FRESH_SECONDS,
+                    generation,
+                ],
+            )
+        except RedisError:
+            logger.warning("Dashboard snapshot could not be cached")
+
+    def _spawn(self, coro: Awaitable) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)  # keep a reference until it finishes
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _with_age(stats: DashboardStatsResponse) -> DashboardStatsResponse:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        age = (now - stats.generated_at).total_seconds() if stats.generated_at else 0
+        return stats.model_copy(update={"snapshot_age_seconds": round(age, 3)})
+
+
+dashboard_cache = DashboardCache()
+
+
+def mark_dashboard_stale(session: Session) -> None:
+    """Invalidate the snapshot once `session` commits."""
+    session.info["dashboard_stale"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_changes(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, WATCHED_MODELS):
+            mark_dashboard_stale(session)
+            return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_writes(orm_execute_state) -> None:
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "fullname", None) in WATCHED_TABLES:
+        mark_dashboard_stale(orm_execute_state.session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop("dashboard_stale", False):
+        dashboard_cache.invalidate_soon()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session: Session) -> None:
+    session.info.pop("dashboard_stale", None)
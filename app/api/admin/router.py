@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.admin.schema import CreateUserRequestModel, UpdateUserRequestModel
 from app.api.admin.service import AdminUserService, DashboardService
-from app.database.postgresql import get_db
+from app.database.postgresql import get_db, get_read_db
 from app.depends.jwt_depends import get_current_admin_user
 from app.depends.language_depends import get_language
 
@@ -16,11 +16,11 @@ router = APIRouter(prefix="/admin", tags=["Admin Dashboard"])
 
 @router.get("/dashboard/stats")
 async def dashboard_stats(
-    db: AsyncSession = Depends(get_db),
     current_admin=Depends(get_current_admin_user),
     lang: str = Depends(get_language),
 ):
-    return await DashboardService.get_dashboard_stats(db, lang)
+    # Queries run concurrently on their own read sessions
+    return await DashboardService.get_dashboard_stats(lang)
 
 
 @router.get("/profile")
@@ -48,7 +48,7 @@ async def list_users(
     skip: int = 0,
     limit: int = 10,
     role: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
     lang: str = Depends(get_language),
 ):
@@ -61,7 +61,7 @@ async def list_users(
 @router.get("/users/{user_uuid}")
 async def get_user(
     user_uuid: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
     lang: str = Depends(get_language),
 ):
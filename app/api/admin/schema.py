@@ -51,6 +51,8 @@ class DashboardStatsResponse(CustomModel):
     recent_users: List[RecentUserSchema]
     recent_orders: List[RecentOrderSchema]
     profit_loss_status: str
+    generated_at: Optional[datetime] = None
+    snapshot_age_seconds: Optional[float] = None
 
 
 class AdminProfileResponse(CustomModel):
@@ -2,10 +2,14 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.admin.dashboard_cache import dashboard_cache
 from app.api.admin.schema import AdminProfileResponse, DashboardStatsResponse
+from app.config import CONFIG_SETTINGS
 from app.core.error.error_types import ErrorType
 from app.core.error.message_codes import MessageCode
 from app.core.response.response_builder import ResponseBuilder
+from app.database.postgresql import gather_in_sessions
+from app.depends.identity_cache import identity_cache
 from app.models.main.categories import TblCategories
 from app.models.main.food import TblFoods
 from app.models.main.restaurants import TblRestaurants
@@ -13,7 +17,17 @@ from app.models.main.restaurants import TblRestaurants
 
 class DashboardService:
     @staticmethod
-    async def get_dashboard_stats(db: AsyncSession, lang: str):
+    async def get_dashboard_stats(lang: str):
+        # Served from the Redis snapshot; recomputed at most once per
+        # DASHBOARD_CACHE_FRESH_SECONDS or after a relevant write
+        stats = await dashboard_cache.get(DashboardService.compute_dashboard_stats)
+
+        return ResponseBuilder.build(
+            ErrorType.SUC_200_OK, MessageCode.LOGIN_SUCCESS, lang, data=stats
+        )
+
+    @staticmethod
+    async def compute_dashboard_stats() -> DashboardStatsResponse:
         from datetime import datetime, timedelta, timezone
 
         from app.api.admin.schema import (
@@ -22,22 +36,72 @@ class DashboardService:
             RecentUserSchema,
             TimeSeriesData,
         )
-        from app.models.main.orders import OrderStatus, TblOrders
+        from app.models.main.orders import (
+            OrderStatus,
+            TblOrderRollupHourly,
+            TblOrders,
+        )
         from app.models.main.users import TblUsers, UserRole
 
         now = datetime.now(timezone.utc).replace(tzinfo=None)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        last_7_days = today_start - timedelta(days=6)
+        prev_7_days_start = last_7_days - timedelta(days=7)
+        last_4_weeks = today_start - timedelta(weeks=4)
+        last_12_months = today_start - timedelta(days=365)
+
+        # Independent query groups, each run on its own pooled session.
+        # Order aggregates come from the hourly rollup, not tbl_orders.
+        async def catalog_counts(session: AsyncSession):
+            return (
+                await TblRestaurants.active_restaurants_count(session),
+                await TblCategories.active_categories_count(session),
+                await TblFoods.active_foods_count(session),
+                await TblUsers.total_users_count(session),
+            )
+
+        async def recent_feed(session: AsyncSession):
+            return (
+                await TblRestaurants.get_recent(session),
+                await TblUsers.get_recent(session, role=UserRole.CUSTOMER),
+                await TblOrders.get_recent_orders(session, limit=5),
+                await TblUsers.get_role_stats(session),
+            )
 
-        # Basic counts from existing model methods
-        restaurants = await TblRestaurants.active_restaurants_count(db)
-        categories = await TblCategories.active_categories_count(db)
-        food_items = await TblFoods.active_foods_count(db)
-        users = await TblUsers.total_users_count(db)
-        recent_res = await TblRestaurants.get_recent(db)
-        recent_usr = await TblUsers.get_recent(db, role=UserRole.CUSTOMER)
+        async def range_stats(session: AsyncSession):
+            return (
+                await TblOrderRollupHourly.get_stats_in_range(session, today_start),
+                await TblOrderRollupHourly.get_stats_in_range(
+                    session, prev_7_days_start, last_7_days
+                ),
+            )
+
+        (
+            (restaurants, categories, food_items, users),
+            (recent_res, recent_usr, recent_orders, role_stats),
+            all_order_stats,
+            (today_stats, prev_7_stats),
+            daily_raw,
+            weekly_raw,
+            monthly_raw,
+        ) = await gather_in_sessions(
+            catalog_counts,
+            recent_feed,
+            TblOrderRollupHourly.get_status_stats,
+            range_stats,
+            lambda session: TblOrderRollupHourly.get_timeseries_stats(
+                session, "day", last_7_days
+            ),
+            lambda session: TblOrderRollupHourly.get_timeseries_stats(
+                session, "week", last_4_weeks
+            ),
+            lambda session: TblOrderRollupHourly.get_timeseries_stats(
+                session, "month", last_12_months
+            ),
+            concurrency=CONFIG_SETTINGS.DASHBOARD_QUERY_CONCURRENCY,
+        )
 
-        # Order totals and revenue via model methods
-        all_order_stats = await TblOrders.get_dashboard_order_stats(db)
+        # Order totals and revenue
         status_counts = {}
         total_orders = 0
         total_revenue = 0.0
@@ -48,17 +112,13 @@ class DashboardService:
                 if status == OrderStatus.DELIVERED:
                     total_revenue += float(amount) if amount else 0.0
 
-        # Today's performance via model methods
-        today_count, today_revenue_sum = await TblOrders.get_stats_in_range(
-            db, today_start
-        )
+        # Today's performance
+        today_count, today_revenue_sum = today_stats
         today_orders = today_count or 0
         today_revenue = float(today_revenue_sum) if today_revenue_sum else 0.0
 
-        # Chart Data Segments via model methods
+        # Chart Data Segments
         # Daily
-        last_7_days = today_start - timedelta(days=6)
-        daily_raw = await TblOrders.get_timeseries_stats(db, "day", last_7_days)
         daily_stats = [
             TimeSeriesData(
                 date=str(row[0].date()),
@@ -69,8 +129,6 @@ class DashboardService:
         ]
 
         # Weekly
-        last_4_weeks = today_start - timedelta(weeks=4)
-        weekly_raw = await TblOrders.get_timeseries_stats(db, "week", last_4_weeks)
         weekly_stats = [
             TimeSeriesData(
                 date=f"Week {row[0].isocalendar()[1]}",
@@ -81,8 +139,6 @@ class DashboardService:
         ]
 
         # 12-Month Base (sliced for 3-month and yearly views)
-        last_12_months = today_start - timedelta(days=365)
-        monthly_raw = await TblOrders.get_timeseries_stats(db, "month", last_12_months)
         all_monthly = [
             TimeSeriesData(
                 date=row[0].strftime("%b %Y"),
@@ -93,23 +149,16 @@ class DashboardService:
         ]
 
         # User Breakdown
-        role_stats = await TblUsers.get_role_stats(db)
         user_roles_counts = {role.value: count for role, count in role_stats if role}
 
-        # Recent Feed
-        recent_orders = await TblOrders.get_recent_orders(db, limit=5)
-
         # Growth Trend Logic
-        prev_7_days_start = last_7_days - timedelta(days=7)
-        _, prev_7_rev_sum = await TblOrders.get_stats_in_range(
-            db, prev_7_days_start, last_7_days
-        )
+        _, prev_7_rev_sum = prev_7_stats
         prev_7_rev = float(prev_7_rev_sum) if prev_7_rev_sum else 0.0
         curr_7_rev = sum(d.revenue for d in daily_stats)
 
         profit_loss = "Growth" if curr_7_rev >= prev_7_rev else "Loss"
 
-        stats = DashboardStatsResponse(
+        return DashboardStatsResponse(
             restaurants=int(restaurants),
             categories=int(categories),
             food_items=int(food_items),
@@ -143,10 +192,7 @@ class DashboardService:
                 for o in recent_orders
             ],
             profit_loss_status=profit_loss,
-        )
-
-        return ResponseBuilder.build(
-            ErrorType.SUC_200_OK, MessageCode.LOGIN_SUCCESS, lang, data=stats
+            generated_at=now,
         )
 
     @staticmethod
@@ -228,6 +274,7 @@ class AdminUserService:
             )
 
         updated_user = await user.update(db, req_data)
+        await identity_cache.invalidate(user_uuid)
 
         response_data = UserResponseModel(
             uuid=updated_user.uuid,
@@ -242,6 +289,7 @@ class AdminUserService:
 
     @staticmethod
     async def delete_user(db: AsyncSession, user_uuid: str, lang: str):
+        from app.models.main.orders import TblOrderRollupHourly
         from app.models.main.users import TblUsers
 
         user = await TblUsers.get_by_uuid(user_uuid, db)
@@ -250,7 +298,10 @@ class AdminUserService:
                 ErrorType.RES_404_NOT_FOUND, MessageCode.USER_NOT_FOUND, lang
             )
 
+        # The user's orders go with them (ON DELETE CASCADE)
+        await TblOrderRollupHourly.remove_user_orders(db, user.usr_id)
         await user.delete(db)
+        await identity_cache.invalidate(user_uuid)
         return ResponseBuilder.build(
             ErrorType.SUC_200_OK, MessageCode.USER_DELETED, lang
         )
@@ -259,7 +310,7 @@ class AdminUserService:
     async def create_user(db: AsyncSession, req_data: dict, lang: str):
         from app.api.admin.schema import UserResponseModel
         from app.models.main.users import TblUsers, UserRole, UsersBaseModel
-        from app.utils.crypto_utils import hash_password
+        from app.utils.crypto_utils import hash_password_async
 
         existing = await TblUsers.get_by_username(req_data["username"], db)
         if existing:
@@ -270,15 +321,13 @@ class AdminUserService:
         new_user = UsersBaseModel(
             username=req_data["username"],
             email=req_data["email"],
-            hashed_password=hash_password(req_data["password"]),
+            hashed_password=await hash_password_async(req_data["password"]),
+            role=UserRole(req_data.get("role", "CUSTOMER")),
             is_active=req_data.get("is_active", True),
         )
 
         user = await TblUsers.create(new_user, db)
-        user.role = UserRole(req_data.get("role", "CUSTOMER"))
-
         await db.commit()
-        await db.refresh(user)
 
         # Decide message code based on role
         msg_code = MessageCode.CUSTOMER_CREATED
@@ -2,8 +2,8 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.main.users import TblUsers, UsersBaseModel, UserRole
-from app.utils.crypto_utils import hash_password, verify_password
-from app.depends.jwt_depends import JWTService
+from app.utils.crypto_utils import hash_password_async, rehash_if_needed, verify_password_async
+from app.depends.jwt_depends import jwt_service
 
 from app.core.response.response_builder import ResponseBuilder
 from app.core.error.error_types import ErrorType
@@ -12,9 +12,6 @@ from app.core.error.message_codes import MessageCode
 from app.api.auth.schema import RegisterRequest, LoginRequest, TokenData, ProfileResponse
 
 
-jwt_service = JWTService()
-
-
 class AdminAuthService:
 
     @staticmethod
@@ -36,15 +33,13 @@ class AdminAuthService:
         new_user = UsersBaseModel(
             username=data.username,
             email=data.email,
-            hashed_password=hash_password(data.password),
+            hashed_password=await hash_password_async(data.password),
+            role=UserRole.ADMIN,
             is_active=True
         )
 
         user = await TblUsers.create(new_user, db)
-        user.role = UserRole.ADMIN
-
         await db.commit()
-        await db.refresh(user)
 
         return ResponseBuilder.build(
             ErrorType.SUC_201_CREATED,
@@ -69,15 +64,19 @@ class AdminAuthService:
                 lang
             )
 
-        if not verify_password(data.password, user.hashed_password):
+        if not await verify_password_async(data.password, user.hashed_password):
             return ResponseBuilder.build(
                 ErrorType.AUTH_401_INVALID_CREDENTIALS,
                 MessageCode.INVALID_CREDENTIALS,
                 lang
             )
 
-        access = await jwt_service.create_access_token(user.uuid, user.role)
-        refresh = await jwt_service.create_refresh_token(user.uuid, user.role)
+        new_hash = await rehash_if_needed(data.password, user.hashed_password)
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+
+        access, refresh = await jwt_service.create_token_pair(user.uuid, user.role)
 
         token_data = TokenData(
             access_token=access,
@@ -11,11 +11,13 @@ from app.api.auth.schema import (
 from app.core.error.error_types import ErrorType
 from app.core.error.message_codes import MessageCode
 from app.core.response.response_builder import ResponseBuilder
-from app.depends.jwt_depends import JWTService
+from app.depends.jwt_depends import jwt_service
 from app.models.main.users import TblUsers, UserRole, UsersBaseModel
-from app.utils.crypto_utils import hash_password, verify_password
-
-jwt_service = JWTService()
+from app.utils.crypto_utils import (
+    hash_password_async,
+    rehash_if_needed,
+    verify_password_async,
+)
 
 
 class CustomerAuthService:
@@ -32,15 +34,12 @@ class CustomerAuthService:
         new_user = UsersBaseModel(
             username=data.username,
             email=data.email,
-            hashed_password=hash_password(data.password),
+            hashed_password=await hash_password_async(data.password),
+            role=UserRole.CUSTOMER,
             is_active=True,
         )
 
         user = await TblUsers.create(new_user, db)
-        user.role = UserRole.CUSTOMER
-
-        await db.commit()
-        await db.refresh(user)
 
         # Notify Admin
         from app.api.notifications.service import NotificationService
@@ -55,6 +54,8 @@ class CustomerAuthService:
             related_user_id=user.usr_id,
         )
 
+        await db.commit()
+
         return ResponseBuilder.build(
             ErrorType.SUC_201_CREATED,
             MessageCode.CUSTOMER_CREATED,
@@ -67,15 +68,21 @@ class CustomerAuthService:
 
         user = await TblUsers.get_by_username(data.username, db)
 
-        if not user or not verify_password(data.password, user.hashed_password):
+        if not user or not await verify_password_async(
+            data.password, user.hashed_password
+        ):
             return ResponseBuilder.build(
                 ErrorType.AUTH_401_INVALID_CREDENTIALS,
                 MessageCode.INVALID_CREDENTIALS,
                 lang,
             )
 
-        access = await jwt_service.create_access_token(user.uuid, user.role)
-        refresh = await jwt_service.create_refresh_token(user.uuid, user.role)
+        new_hash = await rehash_if_needed(data.password, user.hashed_password)
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+
+        access, refresh = await jwt_service.create_token_pair(user.uuid, user.role)
 
         token_data = TokenData(access_token=access, refresh_token=refresh)
 
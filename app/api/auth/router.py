@@ -5,9 +5,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth.admin_service import AdminAuthService
 from app.api.auth.customer_service import CustomerAuthService
+from app.api.auth.token_service import TokenAuthService
 from app.api.auth.schema import (
     LoginRequest,
     ProfileResponse,
+    RefreshRequest,
     RegisterRequest,
     TokenData,
 )
@@ -57,6 +59,14 @@ async def admin_login(
     return await AdminAuthService.login(data, db, lang)
 
 
+@router.post("/refresh", response_model=CustomResponse[TokenData])
+async def refresh_tokens(
+    data: RefreshRequest,
+    lang: str = Depends(get_language),
+):
+    return await TokenAuthService.refresh(data, lang)
+
+
 @router.post("/logout")
 async def logout(lang: str = Depends(get_language)):
     return ResponseBuilder.build(
@@ -17,6 +17,10 @@ class LoginRequest(CustomModel):
     password: str
 
 
+class RefreshRequest(CustomModel):
+    refresh_token: str
+
+
 # ================= RESPONSE DATA MODELS =================
 
 class TokenData(CustomModel):
@@ -0,0 +1,21 @@
+# app/api/auth/token_service.py
+
+from app.api.auth.schema import RefreshRequest, TokenData
+from app.core.error.error_types import ErrorType
+from app.core.error.message_codes import MessageCode
+from app.core.response.response_builder import ResponseBuilder
+from app.depends.jwt_depends import jwt_service
+
+
+class TokenAuthService:
+    @staticmethod
+    async def refresh(data: RefreshRequest, lang: str):
+        # No password check or DB access: the refresh token is swapped for a
+        # new pair atomically in Redis (reuse of a rotated token revokes it)
+        access, refresh = await jwt_service.rotate_refresh_token(data.refresh_token)
+
+        token_data = TokenData(access_token=access, refresh_token=refresh)
+
+        return ResponseBuilder.build(
+            ErrorType.SUC_200_OK, MessageCode.TOKEN_REFRESHED, lang, data=token_data
+        )
@@ -1,6 +1,6 @@
 # app/api/categories/routes.py
 
-from typing import List
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.categories.schema import CategoryCreate, CategoryResponse
 from app.api.categories.service import CategoryService
 from app.core.response.base_schema import CustomResponse
-from app.database.postgresql import get_db
+from app.database.postgresql import get_db, get_read_db
 from app.depends.jwt_depends import get_current_admin_user
 from app.depends.language_depends import get_language
 
@@ -29,21 +29,34 @@ async def create_category(
 # 🔐 ADMIN ONLY - List all categories
 @router.get("/", response_model=CustomResponse[List[CategoryResponse]])
 async def get_all_categories(
-    db: AsyncSession = Depends(get_db),
+    stream: bool = False,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
     lang: str = Depends(get_language),
 ):
-    return await CategoryService.get_all(db, lang)
+    """
+    List all categories.
+
+    `stream=true` writes the list as it is read from a server-side cursor,
+    keeping memory flat for large catalogs. `fields` (comma separated, e.g.
+    `catId,name`) returns only those fields and reads only their columns.
+    """
+    return await CategoryService.get_all(db, lang, stream, fields)
 
 
 # 👤 Public (or can restrict if needed)
 @router.get("/restaurant/{restaurant_id}")
 async def get_categories(
     restaurant_id: int,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     lang: str = Depends(get_language),
 ):
-    return await CategoryService.get_by_restaurant(restaurant_id, db, lang)
+    """
+    List the categories of a restaurant; `fields` as for the full listing.
+    """
+    return await CategoryService.get_by_restaurant(restaurant_id, db, lang, fields)
 
 
 # 🔐 ADMIN ONLY
@@ -1,6 +1,9 @@
 # app/api/categories/schema.py
 
+from pydantic import Field, computed_field
+
 from app.core.response.base_schema import CustomModel
+from app.database.blob_store import media_url
 
 # ================= REQUEST =================
 
@@ -25,5 +28,14 @@ class CategoryResponse(CustomModel):
     cat_id: int
     name: str
     restaurant_id: int
-    image_data: str | None = None
+    image_digest: str | None = Field(default=None, exclude=True)
     description: str | None = None
+
+    @computed_field
+    @property
+    def image_url(self) -> str | None:
+        return media_url(self.image_digest)
+
+
+# Response fields read from a differently named row attribute
+CATEGORY_SOURCES = {"image_url": "image_digest"}
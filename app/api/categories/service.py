@@ -3,28 +3,42 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.categories.schema import CategoryCreate, CategoryResponse, CategoryUpdate
+from app.api.categories.schema import (
+    CATEGORY_SOURCES,
+    CategoryCreate,
+    CategoryResponse,
+    CategoryUpdate,
+)
 from app.core.error.error_types import ErrorType
 from app.core.error.message_codes import MessageCode
 from app.core.response.response_builder import ResponseBuilder
+from app.database.blob_store import InvalidImage, store_image
+from app.database.postgresql import stream_partitions
 from app.models.main.categories import CategoryBaseModel, TblCategories
+from app.utils.fieldset_utils import FieldSet
 
 
 class CategoryService:
     @staticmethod
     async def create(data: CategoryCreate, db: AsyncSession, lang: str):
 
+        try:
+            image_digest = await store_image(data.image_data)
+        except InvalidImage:
+            return ResponseBuilder.build(
+                ErrorType.VAL_400_INVALID_PARAMETERS, MessageCode.INVALID_IMAGE, lang
+            )
+
         # Use the full data model; description is now part of CategoryBaseModel
         category = CategoryBaseModel(
             name=data.name,
             restaurant_id=data.restaurant_id,
-            image_data=data.image_data,
+            image_digest=image_digest,
             description=getattr(data, "description", None),
         )
 
         created = await TblCategories.create(category, db)
         await db.commit()
-        await db.refresh(created)
 
         return ResponseBuilder.build(
             ErrorType.SUC_201_CREATED,
@@ -34,28 +48,67 @@ class CategoryService:
         )
 
     @staticmethod
-    async def get_by_restaurant(restaurant_id: int, db: AsyncSession, lang: str):
+    async def get_by_restaurant(
+        restaurant_id: int, db: AsyncSession, lang: str, fields: str | None = None
+    ):
+
+        try:
+            fieldset = FieldSet(CategoryResponse, fields, sources=CATEGORY_SOURCES)
+        except ValueError:
+            return ResponseBuilder.build(
+                ErrorType.VAL_400_INVALID_PARAMETERS, MessageCode.INVALID_FIELDS, lang
+            )
 
         result = await db.execute(
-            select(TblCategories).where(TblCategories.restaurant_id == restaurant_id)
+            select(TblCategories)
+            .where(TblCategories.restaurant_id == restaurant_id)
+            .options(fieldset.load_only(TblCategories))
         )
 
         categories = result.scalars().all()
 
-        category_list = [CategoryResponse.model_validate(cat) for cat in categories]
+        category_list = fieldset.from_rows(categories)
 
         return ResponseBuilder.build(
-            ErrorType.SUC_200_OK, MessageCode.PROFILE_FETCHED, lang, data=category_list
+            ErrorType.SUC_200_OK,
+            MessageCode.PROFILE_FETCHED,
+            lang,
+            data=category_list,
+            include=fieldset.include_items,
         )
 
     @staticmethod
-    async def get_all(db: AsyncSession, lang: str):
+    async def get_all(
+        db: AsyncSession, lang: str, stream: bool = False, fields: str | None = None
+    ):
         """Return all categories (admin only)"""
-        result = await db.execute(select(TblCategories))
+        try:
+            fieldset = FieldSet(CategoryResponse, fields, sources=CATEGORY_SOURCES)
+        except ValueError:
+            return ResponseBuilder.build(
+                ErrorType.VAL_400_INVALID_PARAMETERS, MessageCode.INVALID_FIELDS, lang
+            )
+
+        stmt = select(TblCategories).options(fieldset.load_only(TblCategories))
+        if stream:
+            return ResponseBuilder.stream(
+                ErrorType.SUC_200_OK,
+                MessageCode.PROFILE_FETCHED,
+                lang,
+                stream_partitions(stmt.order_by(TblCategories.cat_id)),
+                CategoryResponse,
+                fieldset,
+            )
+
+        result = await db.execute(stmt)
         categories = result.scalars().all()
-        category_list = [CategoryResponse.model_validate(cat) for cat in categories]
+        category_list = fieldset.from_rows(categories)
         return ResponseBuilder.build(
-            ErrorType.SUC_200_OK, MessageCode.PROFILE_FETCHED, lang, data=category_list
+            ErrorType.SUC_200_OK,
+            MessageCode.PROFILE_FETCHED,
+            lang,
+            data=category_list,
+            include=fieldset.include_items,
         )
 
     @staticmethod
@@ -94,7 +147,14 @@ class CategoryService:
         if data.name is not None:
             category.name = data.name
         if data.image_data is not None:
-            category.image_data = data.image_data
+            try:
+                category.image_digest = await store_image(data.image_data)
+            except InvalidImage:
+                return ResponseBuilder.build(
+                    ErrorType.VAL_400_INVALID_PARAMETERS,
+                    MessageCode.INVALID_IMAGE,
+                    lang,
+                )
         if getattr(data, "description", None) is not None:
             category.description = data.description
         await db.flush()
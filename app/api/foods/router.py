@@ -1,9 +1,11 @@
 # app/api/foods/routes.py
 
+from typing import Optional
+
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.postgresql import get_db
+from app.database.postgresql import get_db, get_read_db
 from app.depends.jwt_depends import get_current_admin_user
 from app.depends.language_depends import get_language
 
@@ -28,10 +30,17 @@ async def create_food(
 @router.get("/category/{category_id}")
 async def get_foods(
     category_id: int,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     lang: str = Depends(get_language)
 ):
-    return await FoodService.get_by_category(category_id, db, lang)
+    """
+    List the foods of a category.
+
+    `fields` (comma separated, e.g. `name,price`) returns only those fields
+    and reads only their columns.
+    """
+    return await FoodService.get_by_category(category_id, db, lang, fields)
 
 
 # 🔐 ADMIN ONLY
@@ -1,6 +1,9 @@
 # app/api/foods/schema.py
 
+from pydantic import Field, computed_field
+
 from app.core.response.base_schema import CustomModel
+from app.database.blob_store import media_url
 
 # ================= REQUEST =================
 
@@ -28,4 +31,13 @@ class FoodResponse(CustomModel):
     price: float
     category_id: int
     is_available: bool
-    image_data: str | None = None
+    image_digest: str | None = Field(default=None, exclude=True)
+
+    @computed_field
+    @property
+    def image_url(self) -> str | None:
+        return media_url(self.image_digest)
+
+
+# Response fields read from a differently named row attribute
+FOOD_SOURCES = {"image_url": "image_digest"}
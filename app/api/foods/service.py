@@ -3,27 +3,40 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.foods.schema import FoodCreate, FoodResponse, FoodUpdate
+from app.api.foods.schema import (
+    FOOD_SOURCES,
+    FoodCreate,
+    FoodResponse,
+    FoodUpdate,
+)
 from app.core.error.error_types import ErrorType
 from app.core.error.message_codes import MessageCode
 from app.core.response.response_builder import ResponseBuilder
+from app.database.blob_store import InvalidImage, store_image
 from app.models.main.food import FoodSBaseModel, TblFoods
+from app.utils.fieldset_utils import FieldSet
 
 
 class FoodService:
     @staticmethod
     async def create(data: FoodCreate, db: AsyncSession, lang: str):
 
+        try:
+            image_digest = await store_image(data.image_data)
+        except InvalidImage:
+            return ResponseBuilder.build(
+                ErrorType.VAL_400_INVALID_PARAMETERS, MessageCode.INVALID_IMAGE, lang
+            )
+
         food = FoodSBaseModel(
             name=data.name,
             price=data.price,
             category_id=data.category_id,
-            image_data=data.image_data,
+            image_digest=image_digest,
         )
 
         created = await TblFoods.create(food, db)
         await db.commit()
-        await db.refresh(created)
 
         return ResponseBuilder.build(
             ErrorType.SUC_201_CREATED,
@@ -33,18 +46,33 @@ class FoodService:
         )
 
     @staticmethod
-    async def get_by_category(category_id: int, db: AsyncSession, lang: str):
+    async def get_by_category(
+        category_id: int, db: AsyncSession, lang: str, fields: str | None = None
+    ):
+
+        try:
+            fieldset = FieldSet(FoodResponse, fields, sources=FOOD_SOURCES)
+        except ValueError:
+            return ResponseBuilder.build(
+                ErrorType.VAL_400_INVALID_PARAMETERS, MessageCode.INVALID_FIELDS, lang
+            )
 
         result = await db.execute(
-            select(TblFoods).where(TblFoods.category_id == category_id)
+            select(TblFoods)
+            .where(TblFoods.category_id == category_id)
+            .options(fieldset.load_only(TblFoods))
         )
 
         foods = result.scalars().all()
 
-        food_list = [FoodResponse.model_validate(food) for food in foods]
+        food_list = fieldset.from_rows(foods)
 
         return ResponseBuilder.build(
-            ErrorType.SUC_200_OK, MessageCode.PROFILE_FETCHED, lang, data=food_list
+            ErrorType.SUC_200_OK,
+            MessageCode.PROFILE_FETCHED,
+            lang,
+            data=food_list,
+            include=fieldset.include_items,
         )
 
     @staticmethod
@@ -61,7 +89,18 @@ class FoodService:
                 lang,
             )
 
-        for key, value in data.model_dump(exclude_unset=True).items():
+        changes = data.model_dump(exclude_unset=True)
+        if "image_data" in changes:
+            try:
+                changes["image_digest"] = await store_image(changes.pop("image_data"))
+            except InvalidImage:
+                return ResponseBuilder.build(
+                    ErrorType.VAL_400_INVALID_PARAMETERS,
+                    MessageCode.INVALID_IMAGE,
+                    lang,
+                )
+
+        for key, value in changes.items():
             setattr(food, key, value)
 
         await db.commit()
@@ -0,0 +1,104 @@
+# app/api/media/router.py
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
+
+from app.config import CONFIG_SETTINGS
+from app.core.error.error_types import ErrorType
+from app.core.error.message_codes import MessageCode
+from app.core.response.response_builder import ResponseBuilder
+from app.core.response.streaming import ClosingStreamingResponse
+from app.database.blob_store import get_blob_store
+from app.depends.language_depends import get_language
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+
+def _parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """(start, end) of a single `bytes=` range; None to send the whole blob.
+
+    Raises ValueError for a range that cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None  # absent, another unit, or multipart: full response
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if not first:  # suffix range: the last N bytes
+            length = int(last)
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None  # malformed ranges are ignored
+    if not first:
+        if length <= 0:
+            raise ValueError
+        return max(size - length, 0), size - 1
+    if start >= size or start > end:
+        raise ValueError
+    return start, end
+
+
+# 👤 Public
+@router.get("/{digest}")
+async def get_media(
+    digest: str,
+    request: Request,
+    lang: str = Depends(get_language),
+):
+    """
+    Serve a stored image by its SHA-256 digest.
+
+    Blobs are immutable, so responses carry a strong ETag (the digest) and
+    may be cached indefinitely; single byte ranges are supported.
+    """
+    store = get_blob_store()
+    info = await store.stat(digest)
+    if info is None:
+        return ResponseBuilder.build(
+            ErrorType.RES_404_NOT_FOUND, MessageCode.MEDIA_NOT_FOUND, lang
+        )
+
+    etag = f'"{info.digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={CONFIG_SETTINGS.MEDIA_CACHE_MAX_AGE_SECONDS}, immutable"
+        ),
+        "Accept-Ranges": "bytes",
+        "X-Content-Type-Options": "nosniff",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = _parse_range(request.headers.get("range"), info.size)
+        except ValueError:
+            return Response(
+                status_code=416,
+                headers={**headers, "Content-Range": f"bytes */{info.size}"},
+            )
+
+    if byte_range is None:
+        start, end, status_code = 0, info.size - 1, 200
+    else:
+        (start, end), status_code = byte_range, 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    # Aborted range requests are common (media players seeking); close the
+    # blob file as soon as the client goes away
+    return ClosingStreamingResponse(
+        store.read(info.digest, start, end),
+        status_code=status_code,
+        media_type=info.content_type,
+        headers=headers,
+    )
@@ -0,0 +1,86 @@
+"""Background delivery of the notification outbox."""
+import asyncio
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import CONFIG_SETTINGS
+from app.database.postgresql import get_session_maker
+from app.models.main.notifications import TblNotificationOutbox
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationOutboxDispatcher:
+    """Moves outbox rows into `tbl_notifications` in its own transactions.
+
+    Polls every `NOTIFICATION_OUTBOX_POLL_SECONDS` and is woken up early when
+    a session of this worker commits new outbox rows.
+    """
+
+    def __init__(self, poll_interval: float, batch_size: int):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # Deliver what is already committed before the worker exits
+        try:
+            while await self.dispatch_once() == self.batch_size:
+                pass
+        except Exception:
+            logger.exception("Notification outbox flush on shutdown failed")
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def dispatch_once(self) -> int:
+        async with get_session_maker()() as session:
+            moved = await TblNotificationOutbox.dispatch_batch(
+                session, self.batch_size
+            )
+            await session.commit()
+            return moved
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                moved = await self.dispatch_once()
+            except Exception:
+                logger.exception("Notification outbox dispatch failed")
+                moved = 0
+
+            if moved == self.batch_size:
+                continue  # more rows are waiting
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+outbox_dispatcher = NotificationOutboxDispatcher(
+    poll_interval=CONFIG_SETTINGS.NOTIFICATION_OUTBOX_POLL_SECONDS,
+    batch_size=CONFIG_SETTINGS.NOTIFICATION_OUTBOX_BATCH_SIZE,
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session: Session) -> None:
+    if session.info.pop("notification_outbox", False):
+        outbox_dispatcher.wake()
@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.notifications.schema import NotificationListResponse
 from app.api.notifications.service import NotificationService
 from app.core.response.base_schema import CustomResponse
-from app.database.postgresql import get_db
+from app.database.postgresql import get_db, get_read_db
 from app.depends.jwt_depends import get_current_admin_user
 from app.depends.language_depends import get_language
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 @router.get("/admin", response_model=CustomResponse[NotificationListResponse])
 async def get_admin_notifications(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
     lang: str = Depends(get_language),
 ):
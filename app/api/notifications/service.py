@@ -9,6 +9,7 @@ from app.core.response.response_builder import ResponseBuilder
 from app.models.main.notifications import (
     NotificationBaseModel,
     NotificationType,
+    TblNotificationOutbox,
     TblNotifications,
 )
 
@@ -73,7 +74,12 @@ class NotificationService:
         type: NotificationType,
         user_id: Optional[int] = None,
         related_user_id: Optional[int] = None,
-    ):
+    ) -> None:
+        """Queue a notification in the caller's transaction.
+
+        Nothing is committed here: the row lands in the outbox with the
+        caller's own commit and is delivered by the outbox dispatcher.
+        """
         base = NotificationBaseModel(
             user_id=user_id,
             related_user_id=related_user_id,
@@ -81,6 +87,4 @@ class NotificationService:
             message=message,
             type=type,
         )
-        notif = await TblNotifications.create(base, db)
-        await db.commit()
-        return notif
+        TblNotificationOutbox.enqueue(base, db)
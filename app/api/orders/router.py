@@ -9,7 +9,7 @@ from app.api.orders.schema import (
     OrderStatusUpdateRequest,
 )
 from app.api.orders.service import OrderService
-from app.database.postgresql import get_db
+from app.database.postgresql import get_db, get_read_db
 from app.depends.jwt_depends import (
     get_current_admin_user,
     get_current_customer_user,
@@ -41,20 +41,42 @@ async def customer_create_order(
 async def customer_list_orders(
     skip: int = 0,
     limit: int = 10,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_customer_user),
     lang: str = Depends(get_language),
 ):
     """
     List past orders for the authenticated customer.
+
+    Pass the `nextCursor` of a page as `cursor` to fetch the following page
+    (`skip` is then ignored); `include_total=false` skips the count query.
+
+    `fields` (comma separated, e.g. `uuid,status,totalAmount`) limits the
+    order fields returned; `expand` picks the embedded relations from
+    `items` and `user` (default both, empty for none). Unrequested relations
+    are not loaded at all.
     """
-    return await OrderService.list_orders(db, current_user.usr_id, skip, limit, lang)
+    return await OrderService.list_orders(
+        db,
+        current_user.usr_id,
+        skip,
+        limit,
+        lang,
+        cursor,
+        include_total,
+        fields,
+        expand,
+    )
 
 
 @router.get("/customer/{order_uuid}")
 async def customer_get_order(
     order_uuid: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_customer_user),
     lang: str = Depends(get_language),
 ):
@@ -67,7 +89,7 @@ async def customer_get_order(
 @router.get("/customer/{order_uuid}/tracking")
 async def customer_track_order(
     order_uuid: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(get_current_customer_user),
     lang: str = Depends(get_language),
 ):
@@ -98,20 +120,25 @@ async def admin_list_orders(
     skip: int = 0,
     limit: int = 10,
     status: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = None,
+    expand: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
     lang: str = Depends(get_language),
 ):
     """
     List ALL orders in the system. Optional status filtering included.
+    `fields` and `expand` work as for the customer listing.
     """
-    return await OrderService.list_all_orders(db, skip, limit, status, lang)
+    return await OrderService.list_all_orders(
+        db, skip, limit, status, lang, fields, expand
+    )
 
 
 @router.get("/admin/{order_uuid}")
 async def admin_get_order(
     order_uuid: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
     lang: str = Depends(get_language),
 ):
@@ -124,7 +151,7 @@ async def admin_get_order(
 @router.get("/admin/{order_uuid}/tracking")
 async def admin_track_order(
     order_uuid: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_admin=Depends(get_current_admin_user),
     lang: str = Depends(get_language),
 ):
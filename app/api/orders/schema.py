@@ -18,8 +18,9 @@ class AdminOrderCreateRequestModel(OrderCreateRequestModel):
 
 
 class OrderItemResponse(CustomModel):
-    food_id: int
+    food_id: int | None = None
     food_name: str
+    category_id: int | None = None
     quantity: int
     price: float
 
@@ -35,8 +36,9 @@ class OrderResponseModel(CustomModel):
 
 
 class PaginatedOrderResponse(CustomModel):
-    total: int
+    total: int | None = None
     items: List[OrderResponseModel]
+    next_cursor: str | None = None
 
 
 class AdminPaginatedOrderResponse(PaginatedOrderResponse):
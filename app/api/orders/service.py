@@ -15,20 +15,68 @@ from app.core.response.response_builder import ResponseBuilder
 from app.models.main.food import TblFoods
 from app.models.main.orders import (
     OrderSBaseModel,
-    TblOrderItems,
+    TblOrderRollupHourly,
     TblOrders,
     TblOrderStatusHistory,
 )
+from app.models.main.users import TblUsers
+from app.utils.cursor_utils import decode_cursor, encode_cursor
+from app.utils.fieldset_utils import FieldSet
+
+# Relations a listed order can embed, and the response fields they fill
+ORDER_EXPANSIONS = {"items": ("items",), "user": ("user_name",)}
 
 
 class OrderService:
+    @staticmethod
+    def _item_responses(order: TblOrders) -> list[OrderItemResponse]:
+        # Lines carry a snapshot of the food taken at order time; rows
+        # written before the snapshot existed fall back to the food id.
+        return [
+            OrderItemResponse(
+                food_id=item.food_id,
+                food_name=item.food_name or str(item.food_id),
+                category_id=item.category_id,
+                quantity=item.quantity,
+                price=item.price,
+            )
+            for item in order.items
+        ]
+
+    @staticmethod
+    def _list_options(fieldset: FieldSet) -> list:
+        # created_at/user_id back the keyset cursor and the user lookup
+        options = [
+            fieldset.load_only(TblOrders, TblOrders.created_at, TblOrders.user_id)
+        ]
+        if fieldset.wants("items"):
+            options.append(selectinload(TblOrders.items))
+        if fieldset.wants("user"):
+            options.append(selectinload(TblOrders.user).load_only(TblUsers.username))
+        return options
+
+    @staticmethod
+    def _list_response(order: TblOrders, fieldset: FieldSet) -> OrderResponseModel:
+        values = {name: getattr(order, name) for name in fieldset.attributes}
+        if "status" in values:
+            values["status"] = values["status"].value
+        if fieldset.wants("items"):
+            values["items"] = OrderService._item_responses(order)
+        if fieldset.wants("user"):
+            values["user_name"] = (
+                order.user.username if getattr(order, "user", None) else None
+            )
+        return fieldset.build(values)
+
     @staticmethod
     async def create_order(
         db: AsyncSession, user_id: int, request: OrderCreateRequestModel, lang: str
     ):
         if not request.items:
             return ResponseBuilder.build(
-                ErrorType.ERR_400_BAD_REQUEST, MessageCode.INVALID_CREDENTIALS, lang
+                ErrorType.VAL_400_INVALID_PARAMETERS,
+                MessageCode.INVALID_CREDENTIALS,
+                lang,
             )
 
         food_ids = [item.food_id for item in request.items]
@@ -51,42 +99,30 @@ class OrderService:
                     "quantity": item.quantity,
                     "price": food.price,
                     "food_name": food.name,
+                    "category_id": food.category_id,
                 }
             )
 
         if not order_items_data:
             return ResponseBuilder.build(
-                ErrorType.ERR_400_BAD_REQUEST, MessageCode.INVALID_CREDENTIALS, lang
+                ErrorType.VAL_400_INVALID_PARAMETERS,
+                MessageCode.INVALID_CREDENTIALS,
+                lang,
             )
 
         order_model = OrderSBaseModel(user_id=user_id, total_amount=total_amount)
-        new_order = await TblOrders.create(order_model, db)
+        new_order = await TblOrders.create_with_items(order_model, order_items_data, db)
 
-        saved_items = []
-        for item_data in order_items_data:
-            order_item = TblOrderItems(
-                order_id=new_order.ord_id,
+        saved_items = [
+            OrderItemResponse(
                 food_id=item_data["food_id"],
+                food_name=item_data["food_name"],
+                category_id=item_data["category_id"],
                 quantity=item_data["quantity"],
                 price=item_data["price"],
             )
-            db.add(order_item)
-            saved_items.append(
-                OrderItemResponse(
-                    food_id=item_data["food_id"],
-                    food_name=item_data["food_name"],
-                    quantity=item_data["quantity"],
-                    price=item_data["price"],
-                )
-            )
-
-        initial_history = TblOrderStatusHistory(
-            order_id=new_order.ord_id, status=new_order.status
-        )
-        db.add(initial_history)
-
-        await db.flush()
-        await db.commit()
+            for item_data in order_items_data
+        ]
 
         # Notify Admin
         from app.api.notifications.service import NotificationService
@@ -101,6 +137,8 @@ class OrderService:
             related_user_id=new_order.user_id,
         )
 
+        await db.commit()
+
         response = OrderResponseModel(
             uuid=new_order.uuid,
             user_id=new_order.user_id,
@@ -116,119 +154,115 @@ class OrderService:
 
     @staticmethod
     async def list_orders(
-        db: AsyncSession, user_id: int, skip: int, limit: int, lang: str
+        db: AsyncSession,
+        user_id: int,
+        skip: int,
+        limit: int,
+        lang: str,
+        cursor: str | None = None,
+        include_total: bool = True,
+        fields: str | None = None,
+        expand: str | None = None,
     ):
-        from sqlalchemy import func
+        from sqlalchemy import func, tuple_
 
-        count_stmt = select(func.count(TblOrders.ord_id)).where(
-            TblOrders.user_id == user_id
-        )
-        total = await db.scalar(count_stmt) or 0
+        try:
+            fieldset = FieldSet(OrderResponseModel, fields, expand, ORDER_EXPANSIONS)
+        except ValueError:
+            return ResponseBuilder.build(
+                ErrorType.VAL_400_INVALID_PARAMETERS, MessageCode.INVALID_FIELDS, lang
+            )
+
+        total = None
+        if include_total:
+            count_stmt = select(func.count(TblOrders.ord_id)).where(
+                TblOrders.user_id == user_id
+            )
+            total = await db.scalar(count_stmt) or 0
 
+        # Keyset order backed by ix_tbl_orders_user_id_created_at
         stmt = (
             select(TblOrders)
             .where(TblOrders.user_id == user_id)
-            .options(selectinload(TblOrders.items), selectinload(TblOrders.user))
-            .order_by(TblOrders.created_at.desc())
-            .offset(skip)
-            .limit(limit)
+            .options(*OrderService._list_options(fieldset))
+            .order_by(TblOrders.created_at.desc(), TblOrders.ord_id.desc())
         )
 
-        result = await db.execute(stmt)
-        orders = result.scalars().all()
+        if cursor:
+            try:
+                after_created_at, after_id = decode_cursor(cursor)
+            except ValueError:
+                return ResponseBuilder.build(
+                    ErrorType.VAL_400_INVALID_PARAMETERS,
+                    MessageCode.INVALID_CURSOR,
+                    lang,
+                )
+            stmt = stmt.where(
+                tuple_(TblOrders.created_at, TblOrders.ord_id)
+                < tuple_(after_created_at, after_id)
+            )
+        else:
+            stmt = stmt.offset(skip)
 
-        item_food_ids = list({item.food_id for order in orders for item in order.items})
-        foods = await TblFoods.get_by_ids(item_food_ids, db)
-        food_map = {f.food_id: f for f in foods}
+        # One extra row tells whether another page exists
+        result = await db.execute(stmt.limit(limit + 1))
+        orders = result.scalars().all()
 
-        order_responses = []
-        for order in orders:
-            items_response = []
-            for item in order.items:
-                food = food_map.get(item.food_id)
-                items_response.append(
-                    OrderItemResponse(
-                        food_id=item.food_id,
-                        food_name=food.name if food else str(item.food_id),
-                        quantity=item.quantity,
-                        price=item.price,
-                    )
-                )
+        next_cursor = None
+        if len(orders) > limit:
+            orders = orders[:limit]
+            next_cursor = encode_cursor(orders[-1].created_at, orders[-1].ord_id)
 
-            order_responses.append(
-                OrderResponseModel(
-                    uuid=order.uuid,
-                    user_id=order.user_id,
-                    user_name=order.user.username
-                    if getattr(order, "user", None)
-                    else None,
-                    total_amount=order.total_amount,
-                    status=order.status.value,
-                    created_at=order.created_at,
-                    items=items_response,
-                )
-            )
+        order_responses = [
+            OrderService._list_response(order, fieldset) for order in orders
+        ]
 
-        response_data = PaginatedOrderResponse(total=total, items=order_responses)
+        response_data = PaginatedOrderResponse(
+            total=total, items=order_responses, next_cursor=next_cursor
+        )
 
         return ResponseBuilder.build(
-            ErrorType.SUC_200_OK, MessageCode.ORDERS_FETCHED, lang, data=response_data
+            ErrorType.SUC_200_OK,
+            MessageCode.ORDERS_FETCHED,
+            lang,
+            data=response_data,
+            include=fieldset.include_in("items", "total", "next_cursor"),
         )
 
     @staticmethod
     async def get_order(db: AsyncSession, user_id: int, order_uuid: str, lang: str):
-        stmt = (
-            select(TblOrders)
-            .where(TblOrders.user_id == user_id, TblOrders.uuid == order_uuid)
-            .options(selectinload(TblOrders.items), selectinload(TblOrders.user))
-        )
+        payload = await TblOrders.get_detail_json(db, order_uuid, user_id=user_id)
 
-        result = await db.execute(stmt)
-        order = result.scalar_one_or_none()
-
-        if not order:
+        if payload is None:
             return ResponseBuilder.build(
-                ErrorType.ERR_404_NOT_FOUND, MessageCode.ORDER_NOT_FOUND, lang
-            )
-
-        item_food_ids = [item.food_id for item in order.items]
-        foods = await TblFoods.get_by_ids(item_food_ids, db)
-        food_map = {f.food_id: f for f in foods}
-
-        items_response = []
-        for item in order.items:
-            food = food_map.get(item.food_id)
-            items_response.append(
-                OrderItemResponse(
-                    food_id=item.food_id,
-                    food_name=food.name if food else str(item.food_id),
-                    quantity=item.quantity,
-                    price=item.price,
-                )
+                ErrorType.RES_404_NOT_FOUND, MessageCode.ORDER_NOT_FOUND, lang
             )
 
-        response_data = OrderResponseModel(
-            uuid=order.uuid,
-            user_id=order.user_id,
-            user_name=order.user.username if getattr(order, "user", None) else None,
-            total_amount=order.total_amount,
-            status=order.status.value,
-            created_at=order.created_at,
-            items=items_response,
-        )
-
-        return ResponseBuilder.build(
-            ErrorType.SUC_200_OK, MessageCode.ORDER_FETCHED, lang, data=response_data
+        return ResponseBuilder.build_raw(
+            ErrorType.SUC_200_OK, MessageCode.ORDER_FETCHED, lang, payload
         )
 
     @staticmethod
     async def list_all_orders(
-        db: AsyncSession, skip: int, limit: int, status: str | None, lang: str
+        db: AsyncSession,
+        skip: int,
+        limit: int,
+        status: str | None,
+        lang: str,
+        fields: str | None = None,
+        expand: str | None = None,
     ):
         from sqlalchemy import func
 
         from app.models.main.orders import OrderStatus
 
+        try:
+            fieldset = FieldSet(OrderResponseModel, fields, expand, ORDER_EXPANSIONS)
+        except ValueError:
+            return ResponseBuilder.build(
+                ErrorType.VAL_400_INVALID_PARAMETERS, MessageCode.INVALID_FIELDS, lang
+            )
+
         status_counts_stmt = select(
             TblOrders.status, func.count(TblOrders.ord_id)
         ).group_by(TblOrders.status)
@@ -243,7 +277,7 @@ class OrderService:
         count_stmt = select(func.count(TblOrders.ord_id))
         stmt = (
             select(TblOrders)
-            .options(selectinload(TblOrders.items), selectinload(TblOrders.user))
+            .options(*OrderService._list_options(fieldset))
             .order_by(TblOrders.created_at.desc())
         )
 
@@ -261,90 +295,35 @@ class OrderService:
         result = await db.execute(stmt)
         orders = result.scalars().all()
 
-        item_food_ids = list({item.food_id for order in orders for item in order.items})
-        foods = await TblFoods.get_by_ids(item_food_ids, db)
-        food_map = {f.food_id: f for f in foods}
-
-        order_responses = []
-        for order in orders:
-            items_response = []
-            for item in order.items:
-                food = food_map.get(item.food_id)
-                items_response.append(
-                    OrderItemResponse(
-                        food_id=item.food_id,
-                        food_name=food.name if food else str(item.food_id),
-                        quantity=item.quantity,
-                        price=item.price,
-                    )
-                )
-
-            order_responses.append(
-                OrderResponseModel(
-                    uuid=order.uuid,
-                    user_id=order.user_id,
-                    user_name=order.user.username
-                    if getattr(order, "user", None)
-                    else None,
-                    total_amount=order.total_amount,
-                    status=order.status.value,
-                    created_at=order.created_at,
-                    items=items_response,
-                )
-            )
+        order_responses = [
+            OrderService._list_response(order, fieldset) for order in orders
+        ]
 
         response_data = AdminPaginatedOrderResponse(
             total=total, items=order_responses, status_counts=status_counts
         )
 
         return ResponseBuilder.build(
-            ErrorType.SUC_200_OK, MessageCode.ORDERS_FETCHED, lang, data=response_data
+            ErrorType.SUC_200_OK,
+            MessageCode.ORDERS_FETCHED,
+            lang,
+            data=response_data,
+            include=fieldset.include_in(
+                "items", "total", "next_cursor", "status_counts"
+            ),
         )
 
     @staticmethod
     async def get_any_order(db: AsyncSession, order_uuid: str, lang: str):
-        stmt = (
-            select(TblOrders)
-            .where(TblOrders.uuid == order_uuid)
-            .options(selectinload(TblOrders.items), selectinload(TblOrders.user))
-        )
+        payload = await TblOrders.get_detail_json(db, order_uuid)
 
-        result = await db.execute(stmt)
-        order = result.scalar_one_or_none()
-
-        if not order:
+        if payload is None:
             return ResponseBuilder.build(
-                ErrorType.ERR_404_NOT_FOUND, MessageCode.ORDER_NOT_FOUND, lang
-            )
-
-        item_food_ids = [item.food_id for item in order.items]
-        foods = await TblFoods.get_by_ids(item_food_ids, db)
-        food_map = {f.food_id: f for f in foods}
-
-        items_response = []
-        for item in order.items:
-            food = food_map.get(item.food_id)
-            items_response.append(
-                OrderItemResponse(
-                    food_id=item.food_id,
-                    food_name=food.name if food else str(item.food_id),
-                    quantity=item.quantity,
-                    price=item.price,
-                )
+                ErrorType.RES_404_NOT_FOUND, MessageCode.ORDER_NOT_FOUND, lang
             )
 
-        response_data = OrderResponseModel(
-            uuid=order.uuid,
-            user_id=order.user_id,
-            user_name=order.user.username if getattr(order, "user", None) else None,
-            total_amount=order.total_amount,
-            status=order.status.value,
-            created_at=order.created_at,
-            items=items_response,
-        )
-
-        return ResponseBuilder.build(
-            ErrorType.SUC_200_OK, MessageCode.ORDER_FETCHED, lang, data=response_data
+        return ResponseBuilder.build_raw(
+            ErrorType.SUC_200_OK, MessageCode.ORDER_FETCHED, lang, payload
         )
 
     @staticmethod
@@ -357,22 +336,29 @@ class OrderService:
             status_enum = OrderStatus(new_status)
         except ValueError:
             return ResponseBuilder.build(
-                ErrorType.ERR_400_BAD_REQUEST, MessageCode.INVALID_CREDENTIALS, lang
+                ErrorType.VAL_400_INVALID_PARAMETERS,
+                MessageCode.INVALID_CREDENTIALS,
+                lang,
             )
 
+        # Row lock: concurrent changes must see each other's status so the
+        # rollup moves stay exact
         stmt = (
             select(TblOrders)
             .where(TblOrders.uuid == order_uuid)
-            .options(selectinload(TblOrders.items))
+            .with_for_update(of=TblOrders)
         )
         result = await db.execute(stmt)
         order = result.scalar_one_or_none()
 
         if not order:
             return ResponseBuilder.build(
-                ErrorType.ERR_404_NOT_FOUND, MessageCode.ORDER_NOT_FOUND, lang
+                ErrorType.RES_404_NOT_FOUND, MessageCode.ORDER_NOT_FOUND, lang
             )
 
+        await TblOrderRollupHourly.move_status(
+            db, order.created_at, order.total_amount, order.status, status_enum
+        )
         order.status = status_enum
 
         status_history = TblOrderStatusHistory(
@@ -380,8 +366,6 @@ class OrderService:
         )
         db.add(status_history)
 
-        await db.commit()
-
         # Notify Customer
         from app.api.notifications.service import NotificationService
         from app.models.main.notifications import NotificationType
@@ -395,6 +379,8 @@ class OrderService:
             related_user_id=order.user_id,
         )
 
+        await db.commit()
+
         return ResponseBuilder.build(
             ErrorType.SUC_200_OK, MessageCode.ORDER_STATUS_UPDATED, lang
         )
@@ -403,71 +389,17 @@ class OrderService:
     async def track_order(
         db: AsyncSession, user_id: int | None, order_uuid: str, lang: str
     ):
-        from app.api.orders.schema import (
-            OrderStatusHistoryResponse,
-            OrderTrackingResponseModel,
+        # One statement renders the whole tracking payload (order, lines and
+        # status history); it is polled constantly, so no ORM hydration.
+        payload = await TblOrders.get_detail_json(
+            db, order_uuid, user_id=user_id, with_history=True
         )
 
-        stmt = (
-            select(TblOrders)
-            .where(TblOrders.uuid == order_uuid)
-            .options(
-                selectinload(TblOrders.items),
-                selectinload(TblOrders.status_history),
-                selectinload(TblOrders.user),
-            )
-        )
-
-        result = await db.execute(stmt)
-        order = result.scalar_one_or_none()
-
-        if not order:
+        if payload is None:
             return ResponseBuilder.build(
-                ErrorType.ERR_404_NOT_FOUND, MessageCode.ORDER_NOT_FOUND, lang
+                ErrorType.RES_404_NOT_FOUND, MessageCode.ORDER_NOT_FOUND, lang
             )
 
-        if user_id is not None and order.user_id != user_id:
-            return ResponseBuilder.build(
-                ErrorType.ERR_404_NOT_FOUND, MessageCode.ORDER_NOT_FOUND, lang
-            )
-
-        item_food_ids = [item.food_id for item in order.items]
-        foods = await TblFoods.get_by_ids(item_food_ids, db)
-        food_map = {f.food_id: f for f in foods}
-
-        items_response = []
-        for item in order.items:
-            food = food_map.get(item.food_id)
-            items_response.append(
-                OrderItemResponse(
-                    food_id=item.food_id,
-                    food_name=food.name if food else str(item.food_id),
-                    quantity=item.quantity,
-                    price=item.price,
-                )
-            )
-
-        history_response = sorted(
-            [
-                OrderStatusHistoryResponse(
-                    status=h.status.value, created_at=h.created_at
-                )
-                for h in order.status_history
-            ],
-            key=lambda x: x.created_at,
-        )
-
-        response_data = OrderTrackingResponseModel(
-            uuid=order.uuid,
-            user_id=order.user_id,
-            user_name=order.user.username if getattr(order, "user", None) else None,
-            total_amount=order.total_amount,
-            status=order.status.value,
-            created_at=order.created_at,
-            items=items_response,
-            status_history=history_response,
-        )
-
-        return ResponseBuilder.build(
-            ErrorType.SUC_200_OK, MessageCode.ORDER_FETCHED, lang, data=response_data
+        return ResponseBuilder.build_raw(
+            ErrorType.SUC_200_OK, MessageCode.ORDER_FETCHED, lang, payload
         )
@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.postgresql import get_db
+from app.database.postgresql import get_db, get_read_db
 from app.depends.jwt_depends import get_current_admin_user
 from app.depends.language_depends import get_language
 
@@ -27,16 +27,23 @@ async def create_restaurant(
 # 👤 PUBLIC
 @router.get("/")
 async def list_restaurants(
-    db: AsyncSession = Depends(get_db),
+    stream: bool = False,
+    db: AsyncSession = Depends(get_read_db),
     lang: str = Depends(get_language)
 ):
-    return await RestaurantService.get_all(db, lang)
+    """
+    List all restaurants.
+
+    `stream=true` writes the list as it is read from a server-side cursor,
+    keeping memory flat for large catalogs.
+    """
+    return await RestaurantService.get_all(db, lang, stream)
 
 
 @router.get("/{uuid}")
 async def get_restaurant(
     uuid: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     lang: str = Depends(get_language)
 ):
     return await RestaurantService.get_by_uuid(uuid, db, lang)
@@ -11,6 +11,7 @@ from app.api.restaurants.schema import (
 from app.core.error.error_types import ErrorType
 from app.core.error.message_codes import MessageCode
 from app.core.response.response_builder import ResponseBuilder
+from app.database.postgresql import stream_partitions
 from app.models.main.restaurants import RestaurantBaseModel, TblRestaurants
 
 
@@ -24,7 +25,6 @@ class RestaurantService:
 
         created = await TblRestaurants.create(restaurant, db)
         await db.commit()
-        await db.refresh(created)
 
         return ResponseBuilder.build(
             ErrorType.SUC_201_CREATED,
@@ -34,7 +34,18 @@ class RestaurantService:
         )
 
     @staticmethod
-    async def get_all(db: AsyncSession, lang: str):
+    async def get_all(db: AsyncSession, lang: str, stream: bool = False):
+
+        if stream:
+            return ResponseBuilder.stream(
+                ErrorType.SUC_200_OK,
+                MessageCode.PROFILE_FETCHED,
+                lang,
+                stream_partitions(
+                    select(TblRestaurants).order_by(TblRestaurants.res_id)
+                ),
+                RestaurantResponse,
+            )
 
         result = await db.execute(select(TblRestaurants))
         restaurants = result.scalars().all()
@@ -1,6 +1,12 @@
 from fastapi import APIRouter
 
-from app.database.postgresql import create_tables_and_get_names
+from app.database.postgresql import (
+    create_indexes_concurrently,
+    create_tables_and_get_names,
+    get_pool_stats,
+)
+from app.depends.jwt_depends import jwt_service
+from app.depends.revocation_filter import revocation_filter
 from app.utils.schemas_utils import CustomResponse
 
 utils_router = APIRouter()
@@ -17,6 +23,32 @@ async def init_db() -> CustomResponse:
     )
 
 
+@utils_router.get("/metrics/db-pool", tags=["Utils:Database"])
+async def db_pool_metrics() -> CustomResponse:
+    """Live connection pool usage and checkout wait time histogram."""
+    return CustomResponse(
+        status="1",
+        status_code=200,
+        message="Pool stats fetched successfully",
+        data=get_pool_stats(),
+    )
+
+
+@utils_router.get("/metrics/redis", tags=["Utils:Redis"])
+async def redis_session_metrics() -> CustomResponse:
+    """Session store circuit breaker state, queued writes and how many
+    token checks the local revocation filter answered without Redis."""
+    return CustomResponse(
+        status="1",
+        status_code=200,
+        message="Redis session store stats fetched successfully",
+        data={
+            **jwt_service.sessions.snapshot(),
+            "revocation_filter": revocation_filter.snapshot(),
+        },
+    )
+
+
 @utils_router.get("/run-migration", tags=["Utils:Database"])
 async def run_migration() -> CustomResponse:
     """Run manual database migrations like adding new columns."""
@@ -92,6 +124,183 @@ async def run_migration() -> CustomResponse:
         await conn.run_sync(Base.metadata.create_all)
         messages.append("Ensured all missing tables are created")
 
+    # 6. Declared indexes, built online (CREATE INDEX CONCURRENTLY)
+    messages.extend(await create_indexes_concurrently())
+
+    # 7. Snapshot food name/category on order lines, backfilled in batches
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "ALTER TABLE public.tbl_order_items "
+                "ADD COLUMN IF NOT EXISTS item_food_name VARCHAR(200), "
+                "ADD COLUMN IF NOT EXISTS item_category_id INTEGER;"
+            )
+        )
+        messages.append("Ensured item_food_name/item_category_id on tbl_order_items")
+
+    backfilled = 0
+    while True:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                text(
+                    "UPDATE public.tbl_order_items i "
+                    "SET item_food_name = f.food_name, "
+                    "item_category_id = f.food_category_id "
+                    "FROM public.tbl_foods f "
+                    "WHERE i.item_id IN ("
+                    "  SELECT i2.item_id FROM public.tbl_order_items i2 "
+                    "  JOIN public.tbl_foods f2 ON f2.food_id = i2.item_food_id "
+                    "  WHERE i2.item_food_name IS NULL LIMIT 5000"
+                    ") AND f.food_id = i.item_food_id;"
+                )
+            )
+        if not result.rowcount:
+            break
+        backfilled += result.rowcount
+    messages.append(f"Backfilled food snapshot on {backfilled} order items")
+
+    # 7b. Keep order lines when their food is deleted: the food FK used to
+    # cascade; it now clears item_food_id. Re-added NOT VALID and validated
+    # separately, so order writes are not blocked by a full-table check
+    async with engine.begin() as conn:
+        cascading = (
+            await conn.execute(
+                text(
+                    "SELECT conname FROM pg_constraint "
+                    "WHERE conrelid = 'public.tbl_order_items'::regclass "
+                    "AND confrelid = 'public.tbl_foods'::regclass "
+                    "AND contype = 'f' AND confdeltype <> 'n';"
+                )
+            )
+        ).scalars().all()
+        for name in cascading:
+            await conn.execute(
+                text(f'ALTER TABLE public.tbl_order_items DROP CONSTRAINT "{name}";')
+            )
+        if cascading:
+            await conn.execute(
+                text(
+                    "ALTER TABLE public.tbl_order_items "
+                    "ALTER COLUMN item_food_id DROP NOT NULL, "
+                    "ADD CONSTRAINT tbl_order_items_item_food_id_fkey "
+                    "FOREIGN KEY (item_food_id) "
+                    "REFERENCES public.tbl_foods (food_id) "
+                    "ON DELETE SET NULL NOT VALID;"
+                )
+            )
+    if cascading:
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    "ALTER TABLE public.tbl_order_items "
+                    "VALIDATE CONSTRAINT tbl_order_items_item_food_id_fkey;"
+                )
+            )
+        messages.append("tbl_order_items.item_food_id now ON DELETE SET NULL")
+    else:
+        messages.append("tbl_order_items.item_food_id already ON DELETE SET NULL")
+
+    # 8. Shard the hourly order rollup, then rebuild it from tbl_orders
+    async with engine.begin() as conn:
+        sharded = await conn.scalar(
+            text(
+                "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+                "WHERE table_schema = 'public' "
+                "AND table_name = 'tbl_order_rollup_hourly' "
+                "AND column_name = 'rlp_shard');"
+            )
+        )
+        if not sharded:
+            await conn.execute(
+                text(
+                    "ALTER TABLE public.tbl_order_rollup_hourly "
+                    "ADD COLUMN rlp_shard SMALLINT NOT NULL DEFAULT 0, "
+                    "DROP CONSTRAINT tbl_order_rollup_hourly_pkey, "
+                    "ADD PRIMARY KEY (rlp_bucket, rlp_status, rlp_shard);"
+                )
+            )
+            messages.append("Added rlp_shard to tbl_order_rollup_hourly")
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.models.main.orders import TblOrderRollupHourly
+
+    async with AsyncSession(engine) as session:
+        rows = await TblOrderRollupHourly.rebuild(session)
+        await session.commit()
+    messages.append(f"Rebuilt tbl_order_rollup_hourly ({rows} rows)")
+
+    # 9. Move inline food/category images into the blob store
+    from app.database.blob_store import (
+        InvalidImage,
+        decode_image_payload,
+        get_blob_store,
+    )
+
+    store = get_blob_store()
+    for table, id_col, inline_col, digest_col in (
+        ("tbl_foods", "food_id", "food_image", "food_image_digest"),
+        ("tbl_categories", "cat_id", "cat_image", "cat_image_digest"),
+    ):
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(
+                    f"ALTER TABLE public.{table} "
+                    f"ADD COLUMN IF NOT EXISTS {digest_col} VARCHAR(64);"
+                )
+            )
+            has_inline = await conn.scalar(
+                text(
+                    "SELECT EXISTS (SELECT 1 FROM information_schema.columns "
+                    "WHERE table_schema = 'public' AND table_name = :table "
+                    "AND column_name = :column);"
+                ),
+                {"table": table, "column": inline_col},
+            )
+        if not has_inline:
+            messages.append(f"{table} has no inline images to move")
+            continue
+
+        moved, skipped, last_id = 0, 0, 0
+        while True:
+            async with engine.connect() as conn:
+                rows = (
+                    await conn.execute(
+                        text(
+                            f"SELECT {id_col}, {inline_col} FROM public.{table} "
+                            f"WHERE {id_col} > :last_id AND {inline_col} IS NOT NULL "
+                            f"ORDER BY {id_col} LIMIT 100;"
+                        ),
+                        {"last_id": last_id},
+                    )
+                ).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            updates = []
+            for row_id, inline in rows:
+                try:
+                    digest = await store.put(decode_image_payload(inline))
+                except InvalidImage:
+                    skipped += 1  # left inline for manual review
+                    continue
+                updates.append({"row_id": row_id, "digest": digest})
+            if updates:
+                async with engine.begin() as conn:
+                    await conn.execute(
+                        text(
+                            f"UPDATE public.{table} SET {digest_col} = :digest, "
+                            f"{inline_col} = NULL WHERE {id_col} = :row_id;"
+                        ),
+                        updates,
+                    )
+                moved += len(updates)
+        messages.append(
+            f"Moved {moved} {table} images to the blob store "
+            f"({skipped} invalid left in {inline_col})"
+        )
+
     return CustomResponse(
         status="1",
         status_code=200,
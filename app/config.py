@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -35,6 +35,49 @@ class Settings(BaseSettings):
     POSTGRESQL_DB_PASSWORD: str = "postgres"
     POSTGRESQL_DB_POOL_SIZE: int = 10
     POSTGRESQL_DB_MAX_OVERFLOW: int = 20
+    POSTGRESQL_DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    POSTGRESQL_DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    POSTGRESQL_DB_POOL_PRE_PING: bool = True
+    POSTGRESQL_DB_ECHO: bool = False
+    # Rows per server-side cursor fetch when streaming large listings
+    POSTGRESQL_STREAM_CHUNK_SIZE: int = 500
+
+    # Optional read replica (same credentials and database as the primary)
+    POSTGRESQL_REPLICA_DB_HOST: str | None = None
+    POSTGRESQL_REPLICA_DB_PORT: int | None = None
+    POSTGRESQL_REPLICA_STICKY_SECONDS: int = 5  # read-your-writes window
+
+    # ==========================================
+    # Media Storage
+    # ==========================================
+    MEDIA_STORE_BACKEND: str = "local"
+    MEDIA_LOCAL_ROOT: str = "media"  # blob directory for the local backend
+    MEDIA_MAX_IMAGE_BYTES: int = 5 * 1024 * 1024
+    MEDIA_CACHE_MAX_AGE_SECONDS: int = 365 * 24 * 3600  # blobs never change
+
+    # ==========================================
+    # Admin Dashboard
+    # ==========================================
+    # Sessions one dashboard load may use at once (keep below the pool size)
+    DASHBOARD_QUERY_CONCURRENCY: int = 4
+    DASHBOARD_CACHE_FRESH_SECONDS: int = 15  # served without a refresh
+    DASHBOARD_CACHE_MAX_STALE_SECONDS: int = 600  # served while refreshing
+    DASHBOARD_CACHE_LOCK_SECONDS: int = 30  # upper bound on one refresh
+    # Rows per (hour, status) in the order rollup; spreads concurrent order
+    # writes over that many row locks
+    ORDER_ROLLUP_SHARDS: int = 8
+
+    # ==========================================
+    # User Identity Cache
+    # ==========================================
+    USER_IDENTITY_CACHE_SIZE: int = 10_000  # entries per worker
+    USER_IDENTITY_CACHE_TTL_SECONDS: float = 60.0  # bound on missed evictions
+
+    # ==========================================
+    # Notification Outbox
+    # ==========================================
+    NOTIFICATION_OUTBOX_POLL_SECONDS: float = 2.0
+    NOTIFICATION_OUTBOX_BATCH_SIZE: int = 100
 
     # ==========================================
     # Redis Settings
@@ -44,6 +87,17 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASS: str = "YOURPASSWORD"
     SSL_CA_CERTS: str | None = None
+    REDIS_MAX_CONNECTIONS: int = 50  # shared by the whole worker
+    REDIS_POOL_TIMEOUT: float = 5.0  # seconds to wait for a free connection
+    REDIS_SOCKET_TIMEOUT: float = 2.0
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 2.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    # Token-session calls: per-call budget and circuit breaker
+    REDIS_SESSION_TIMEOUT_SECONDS: float = 0.2
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive failures to open
+    REDIS_BREAKER_RESET_SECONDS: float = 5.0  # open time before a trial call
+    REDIS_LOCAL_REVOCATIONS_SIZE: int = 100_000
+    REDIS_PENDING_WRITES_MAX: int = 10_000  # queued while Redis is down
 
     # ==========================================
     # JWT Settings
@@ -53,12 +107,26 @@ class Settings(BaseSettings):
 
     APP_JWT_PRIVATE_KEY: str = ""
     APP_JWT_PUBLIC_KEY: str = ""
+    APP_JWT_KEY_ID: str = "default"  # "kid" header of issued tokens
+    # kid -> public PEM of retired signing keys, still accepted on verify
+    APP_JWT_RETIRED_PUBLIC_KEYS: Dict[str, str] = {}
+    # Recently verified access tokens skip signature checks (per worker)
+    VERIFIED_TOKEN_CACHE_SIZE: int = 10_000
+    VERIFIED_TOKEN_CACHE_TTL_SECONDS: float = 300.0  # never beyond the token exp
+    # Full reload of the per-worker current-token index (pub/sub between)
+    REVOCATION_RESYNC_SECONDS: float = 60.0
 
     # ==========================================
     # Security / Encryption
     # ==========================================
     ENCRYPTION_KEY: str = "mysecretkey123"
-    ALGORITHM: str = "RS256"
+    # Password hashing (scrypt); raising these upgrades hashes on next login
+    PASSWORD_SCRYPT_N: int = 2**14
+    PASSWORD_SCRYPT_R: int = 8
+    PASSWORD_SCRYPT_P: int = 1
+    PASSWORD_HASH_CONCURRENCY: int = 4  # hashing threads per worker
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 2.0  # then 503
+    ALGORITHM: str = "RS256"  # JWT signing: RS256, ES256 or EdDSA
     JWT_AUDIENCE: str = "api"
 
     # ==========================================
@@ -6,6 +6,7 @@ class MessageCode(StrEnum):
     ADMIN_CREATED = "ADMIN_CREATED"
     DELIVERY_PARTNER_CREATED = "DELIVERY_PARTNER_CREATED"
     LOGIN_SUCCESS = "LOGIN_SUCCESS"
+    TOKEN_REFRESHED = "TOKEN_REFRESHED"
 
     INVALID_CREDENTIALS = "INVALID_CREDENTIALS"
     USERNAME_EXISTS = "USERNAME_EXISTS"
@@ -22,3 +23,7 @@ class MessageCode(StrEnum):
     ORDER_FETCHED = "ORDER_FETCHED"
     ORDER_NOT_FOUND = "ORDER_NOT_FOUND"
     ORDER_STATUS_UPDATED = "ORDER_STATUS_UPDATED"
+    INVALID_CURSOR = "INVALID_CURSOR"
+    INVALID_IMAGE = "INVALID_IMAGE"
+    MEDIA_NOT_FOUND = "MEDIA_NOT_FOUND"
+    INVALID_FIELDS = "INVALID_FIELDS"
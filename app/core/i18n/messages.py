@@ -11,6 +11,11 @@ MESSAGES: dict[MessageCode, dict[str, str]] = {
         "ar": "تم تسجيل الدخول بنجاح",
         "hi": "लॉगिन सफल हुआ",
     },
+    MessageCode.TOKEN_REFRESHED: {
+        "en": "Token refreshed successfully",
+        "ar": "تم تحديث الرمز بنجاح",
+        "hi": "टोकन सफलतापूर्वक रीफ़्रेश किया गया",
+    },
     MessageCode.INVALID_CREDENTIALS: {
         "en": "Invalid credentials",
         "ar": "بيانات اعتماد غير صالحة",
@@ -76,4 +81,24 @@ MESSAGES: dict[MessageCode, dict[str, str]] = {
         "ar": "تم تحديث حالة الطلب بنجاح",
         "hi": "ऑर्डर की स्थिति सफलतापूर्वक अपडेट की गई",
     },
+    MessageCode.INVALID_CURSOR: {
+        "en": "Invalid pagination cursor",
+        "ar": "مؤشر ترقيم الصفحات غير صالح",
+        "hi": "अमान्य पेजिनेशन कर्सर",
+    },
+    MessageCode.INVALID_IMAGE: {
+        "en": "Image must be a base64 PNG, JPEG, GIF or WebP within the size limit",
+        "ar": "يجب أن تكون الصورة بصيغة PNG أو JPEG أو GIF أو WebP بترميز base64 وضمن الحد المسموح للحجم",
+        "hi": "छवि आकार सीमा के भीतर base64 PNG, JPEG, GIF या WebP होनी चाहिए",
+    },
+    MessageCode.MEDIA_NOT_FOUND: {
+        "en": "Media not found",
+        "ar": "الوسائط غير موجودة",
+        "hi": "मीडिया नहीं मिला",
+    },
+    MessageCode.INVALID_FIELDS: {
+        "en": "Unknown field or expansion requested",
+        "ar": "تم طلب حقل أو توسيع غير معروف",
+        "hi": "अज्ञात फ़ील्ड या विस्तार का अनुरोध किया गया",
+    },
 }
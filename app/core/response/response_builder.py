@@ -1,26 +1,139 @@
+import logging
+from contextlib import aclosing
+from functools import lru_cache
+from typing import Any, AsyncGenerator, AsyncIterator, Iterable, Tuple, Type
+
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
 
 from app.core.i18n.message_resolver import MessageResolver
 from app.core.response.base_schema import CustomResponse
 from app.core.response.status_mapper import get_http_status
+from app.core.response.streaming import ClosingStreamingResponse
+from app.utils.fieldset_utils import FieldSet
+
+logger = logging.getLogger(__name__)
+
+# Serializes `data` exactly as the `CustomResponse.data` field would
+_DATA_ADAPTER = TypeAdapter(Any)
+
+
+@lru_cache(maxsize=4096)
+def _envelope(error_type, message_code, lang) -> Tuple[int, bytes, bytes]:
+    """(status code, encoded envelope up to `"data":`, closing bytes).
+
+    Everything but `data` depends only on these three arguments, so each
+    combination is rendered once; `data` is the envelope's last field.
+    """
+    status_code = get_http_status(error_type)
+
+    envelope = CustomResponse(
+        status=1 if status_code < 400 else -1,
+        error_type=error_type,
+        message=MessageResolver.resolve(message_code, lang),
+        status_code=status_code,
+    )
+    encoded = envelope.__pydantic_serializer__.to_json(envelope, by_alias=True)
+
+    head, _, tail = encoded.rpartition(b'"data":null')
+    return status_code, head + b'"data":', tail
 
 
 class ResponseBuilder:
     @staticmethod
-    def build(error_type, message_code, lang="en", data=None):
+    def build(error_type, message_code, lang="en", data=None, include=None):
+        """Splice the JSON-encoded `data` into the cached envelope.
 
-        status_code = get_http_status(error_type)
+        `data` is serialized by pydantic's compiled serializer straight to
+        bytes (camelCase aliases, ISO datetimes); values it cannot serialize
+        fall back to `jsonable_encoder`. `include` limits the fields written
+        (pydantic `include` syntax, e.g. from `FieldSet.include_in`).
+        """
 
-        response = CustomResponse(
-            status=1 if status_code < 400 else -1,
-            error_type=error_type,
-            message=MessageResolver.resolve(message_code, lang),
-            status_code=status_code,
-            data=data,
+        status_code, head, tail = _envelope(error_type, message_code, lang)
+
+        data_json = (
+            b"null"
+            if data is None
+            else _DATA_ADAPTER.dump_json(
+                data, by_alias=True, include=include, fallback=jsonable_encoder
+            )
         )
 
-        return JSONResponse(
+        return Response(
+            content=head + data_json + tail,
             status_code=status_code,  # 👈 THIS FIXES YOUR ISSUE
-            content=jsonable_encoder(response),
+            media_type="application/json",
+        )
+
+    @staticmethod
+    def build_raw(error_type, message_code, lang="en", data_json: str | bytes = b"null"):
+        """Same envelope as `build`, with `data` given as already-encoded JSON.
+
+        `data_json` is spliced in unchanged, e.g. a document produced by
+        PostgreSQL.
+        """
+
+        status_code, head, tail = _envelope(error_type, message_code, lang)
+
+        if isinstance(data_json, str):
+            data_json = data_json.encode("utf-8")
+
+        return Response(
+            content=head + data_json + tail,
+            status_code=status_code,
+            media_type="application/json",
+        )
+
+    @staticmethod
+    def stream(
+        error_type,
+        message_code,
+        lang: str,
+        chunks: AsyncGenerator[Iterable[Any], None],
+        model: Type[BaseModel],
+        fieldset: FieldSet | None = None,
+    ):
+        """Same envelope as `build`, with `data` a JSON array written as
+        `chunks` (e.g. `stream_partitions`) arrive.
+
+        Each row is validated into `model` (or built by `fieldset`, writing
+        only its fields) and encoded, and each chunk is sent as soon as it is
+        encoded, so memory does not grow with the number of rows. The status
+        is sent before the first row is read: a failure mid-stream can only
+        abort the connection, leaving the client a truncated (invalid)
+        document. If the client goes away, `chunks` is closed right away,
+        releasing its cursor and connection.
+        """
+
+        status_code, head, tail = _envelope(error_type, message_code, lang)
+        to_item = fieldset.from_row if fieldset else model.model_validate
+        include = fieldset.include if fieldset else None
+
+        async def body() -> AsyncIterator[bytes]:
+            yield head + b"["
+            first = True
+            try:
+                async with aclosing(chunks) as rows:
+                    async for chunk in rows:
+                        encoded = b",".join(
+                            _DATA_ADAPTER.dump_json(
+                                to_item(row),
+                                by_alias=True,
+                                include=include,
+                                fallback=jsonable_encoder,
+                            )
+                            for row in chunk
+                        )
+                        if encoded:
+                            yield encoded if first else b"," + encoded
+                            first = False
+            except Exception:
+                logger.exception("Streamed %s response aborted", model.__name__)
+                raise
+            yield b"]" + tail
+
+        return ClosingStreamingResponse(
+            body(), status_code=status_code, media_type="application/json"
         )
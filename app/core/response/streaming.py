@@ -0,0 +1,13 @@
+from fastapi.responses import StreamingResponse
+
+
+class ClosingStreamingResponse(StreamingResponse):
+    """Closes its body generator as soon as streaming stops, including when
+    the client disconnects (starlette leaves that to garbage collection), so
+    the generator's cleanup (cursor, file handle, ...) runs right away."""
+
+    async def stream_response(self, send) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            await self.body_iterator.aclose()
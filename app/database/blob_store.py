@@ -0,0 +1,181 @@
+"""Content-addressed storage for images.
+
+A blob is stored under the hex SHA-256 of its bytes, so its address never
+changes while it exists and identical uploads are stored once. Rows keep
+only the digest; `/media/{digest}` serves the bytes.
+
+The backend is chosen by `MEDIA_STORE_BACKEND`. `LocalBlobStore` keeps
+blobs on the local filesystem; other backends (object storage, ...) only
+need to implement `BlobStore`.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from app.config import CONFIG_SETTINGS
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+_DATA_URL_RE = re.compile(r"^data:[\w/+.-]*(;[\w=-]+)*;base64,", re.IGNORECASE)
+_READ_CHUNK_SIZE = 64 * 1024
+
+# Leading bytes -> content type; only these formats are accepted
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+
+class InvalidImage(ValueError):
+    """The payload is not a supported image, or is too large."""
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    for signature, content_type in _IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def decode_image_payload(value: str) -> bytes:
+    """Bytes of an inline image given as a base64 data URL or bare base64."""
+    payload = _DATA_URL_RE.sub("", value.strip(), count=1)
+    try:
+        data = base64.b64decode(payload, validate=True)
+    except (binascii.Error, ValueError):
+        raise InvalidImage("Image is not valid base64")
+    if len(data) > CONFIG_SETTINGS.MEDIA_MAX_IMAGE_BYTES:
+        raise InvalidImage("Image is too large")
+    if sniff_image_type(data[:16]) is None:
+        raise InvalidImage("Unsupported image format")
+    return data
+
+
+def is_digest(value: str) -> bool:
+    return bool(_DIGEST_RE.match(value))
+
+
+def media_url(digest: str | None) -> str | None:
+    return f"{CONFIG_SETTINGS.ROOT_PATH}/media/{digest}" if digest else None
+
+
+@dataclass(frozen=True)
+class BlobInfo:
+    digest: str
+    size: int
+    content_type: str
+
+
+class BlobStore(ABC):
+    @abstractmethod
+    async def put(self, data: bytes) -> str:
+        """Store `data` (idempotent) and return its digest."""
+
+    @abstractmethod
+    async def stat(self, digest: str) -> BlobInfo | None:
+        """Size and type of a stored blob, or None if there is none."""
+
+    @abstractmethod
+    def read(self, digest: str, start: int, end: int) -> AsyncIterator[bytes]:
+        """Stream bytes `start`..`end` (inclusive) of a stored blob."""
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs as files under `root/<aa>/<bb>/<digest>`.
+
+    Files are written to a temporary name and renamed into place, so a
+    reader never sees a partial blob. File IO runs in worker threads.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def _write(self, digest: str, data: bytes) -> None:
+        path = self._path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _stat(self, digest: str) -> BlobInfo | None:
+        try:
+            with open(self._path(digest), "rb") as f:
+                head = f.read(16)
+                size = os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            return None
+        content_type = sniff_image_type(head) or "application/octet-stream"
+        return BlobInfo(digest=digest, size=size, content_type=content_type)
+
+    async def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        await asyncio.to_thread(self._write, digest, data)
+        return digest
+
+    async def stat(self, digest: str) -> BlobInfo | None:
+        if not is_digest(digest):
+            return None
+        return await asyncio.to_thread(self._stat, digest)
+
+    async def read(self, digest: str, start: int, end: int) -> AsyncIterator[bytes]:
+        f = await asyncio.to_thread(open, self._path(digest), "rb")
+        try:
+            await asyncio.to_thread(f.seek, start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await asyncio.to_thread(
+                    f.read, min(_READ_CHUNK_SIZE, remaining)
+                )
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+
+_store: BlobStore | None = None
+
+
+def get_blob_store() -> BlobStore:
+    global _store
+    if _store is None:
+        backend = CONFIG_SETTINGS.MEDIA_STORE_BACKEND
+        if backend != "local":
+            raise ValueError(f"Unknown MEDIA_STORE_BACKEND {backend!r}")
+        _store = LocalBlobStore(CONFIG_SETTINGS.MEDIA_LOCAL_ROOT)
+    return _store
+
+
+async def store_image(value: str | None) -> str | None:
+    """Digest of an inline image payload after storing it.
+
+    None or "" (no image) give None. Raises `InvalidImage` for payloads
+    that are not a supported image.
+    """
+    if not value:
+        return None
+    data = decode_image_payload(value)
+    return await get_blob_store().put(data)
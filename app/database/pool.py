@@ -0,0 +1,89 @@
+"""Instrumented connection pool for the async PostgreSQL engine.
+
+The engine in `app.database.postgresql` is built with `InstrumentedQueuePool`
+so that live pool usage (checked out connections, overflow, callers waiting
+for a connection and how long checkouts take) can be read at runtime and the
+pool sized against real traffic.
+"""
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Tuple
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+# Upper bounds (milliseconds) of the checkout wait histogram buckets
+CHECKOUT_WAIT_BUCKETS_MS: Tuple[float, ...] = (
+    1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000,
+)
+
+
+class CheckoutWaitHistogram:
+    """Fixed-bucket histogram of connection checkout wait times."""
+
+    def __init__(self, buckets: Tuple[float, ...] = CHECKOUT_WAIT_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, wait_ms: float) -> None:
+        self.counts[bisect_left(self.buckets, wait_ms)] += 1
+        self.count += 1
+        self.sum_ms += wait_ms
+        self.max_ms = max(self.max_ms, wait_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{b:g}ms" for b in self.buckets] + ["le_inf"]
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "avg_ms": round(self.sum_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """`AsyncAdaptedQueuePool` that records waiters and checkout wait times."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.waiters = 0
+        self.checkout_errors = 0
+        self.checkout_wait = CheckoutWaitHistogram()
+
+    def connect(self) -> PoolProxiedConnection:
+        # Every coroutine suspended in here is waiting for a connection,
+        # either queued on the pool or for a new one to be established.
+        self.waiters += 1
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except Exception:
+            self.checkout_errors += 1
+            raise
+        finally:
+            self.waiters -= 1
+            self.checkout_wait.observe((time.perf_counter() - start) * 1000)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        # Keep the histogram across pool recreation (e.g. after invalidation)
+        pool = super().recreate()
+        pool.checkout_wait = self.checkout_wait
+        pool.checkout_errors = self.checkout_errors
+        return pool  # type: ignore[return-value]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "waiters": self.waiters,
+            "checkout_errors": self.checkout_errors,
+            "checkout_wait": self.checkout_wait.snapshot(),
+        }
@@ -2,29 +2,51 @@
 from __future__ import annotations
 
 import asyncio
-from typing import AsyncGenerator, List
+import hashlib
+import time
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Sequence,
+)
 
+from fastapi import Request
+from sqlalchemy import Select, event, inspect, text
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateIndex
 
 from app.config import CONFIG_SETTINGS
+from app.database.pool import InstrumentedQueuePool
 from app.models.base_class import Base
 
 
 _engine: AsyncEngine | None = None
 _session_maker: async_sessionmaker[AsyncSession] | None = None
 
+_read_engine: AsyncEngine | None = None
+_read_session_maker: async_sessionmaker[AsyncSession] | None = None
+
+# client key -> monotonic deadline until which its reads stay on the primary
+_sticky_clients: Dict[str, float] = {}
+_STICKY_PRUNE_THRESHOLD = 10_000
 
-def get_database_url() -> str:
+
+def get_database_url(host: str | None = None, port: int | None = None) -> str:
     user = CONFIG_SETTINGS.POSTGRESQL_DB_USER
     password = CONFIG_SETTINGS.POSTGRESQL_DB_PASSWORD
-    host = CONFIG_SETTINGS.POSTGRESQL_DB_HOST or "localhost"
-    port = CONFIG_SETTINGS.POSTGRESQL_DB_PORT or 5432
+    host = host or CONFIG_SETTINGS.POSTGRESQL_DB_HOST or "localhost"
+    port = port or CONFIG_SETTINGS.POSTGRESQL_DB_PORT or 5432
     db = CONFIG_SETTINGS.POSTGRESQL_DB_NAME or "postgres"
 
     connection= f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{db}"    
@@ -32,29 +54,180 @@ def get_database_url() -> str:
     return connection
 
 
-def init_engine(echo: bool = False) -> AsyncEngine:
-    global _engine, _session_maker
+def _create_engine(url: str, echo: bool) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=echo,
+        poolclass=InstrumentedQueuePool,
+        pool_size=CONFIG_SETTINGS.POSTGRESQL_DB_POOL_SIZE,
+        max_overflow=CONFIG_SETTINGS.POSTGRESQL_DB_MAX_OVERFLOW,
+        pool_timeout=CONFIG_SETTINGS.POSTGRESQL_DB_POOL_TIMEOUT,
+        pool_recycle=CONFIG_SETTINGS.POSTGRESQL_DB_POOL_RECYCLE,
+        pool_pre_ping=CONFIG_SETTINGS.POSTGRESQL_DB_POOL_PRE_PING,
+    )
+
+
+def init_engine(echo: bool | None = None) -> AsyncEngine:
+    """Build the engines and their pools from the `POSTGRESQL_DB_*` settings.
+
+    A replica engine is only created when `POSTGRESQL_REPLICA_DB_HOST` is set.
+    """
+    global _engine, _session_maker, _read_engine, _read_session_maker
+
+    if echo is None:
+        echo = CONFIG_SETTINGS.POSTGRESQL_DB_ECHO
 
     if _engine is None:
-        _engine = create_async_engine(
-            get_database_url(),
-            echo=echo,
-            pool_pre_ping=True,
-        )
+        _engine = _create_engine(get_database_url(), echo)
         _session_maker = async_sessionmaker(
             _engine, expire_on_commit=False
         )
 
+    if _read_engine is None and CONFIG_SETTINGS.POSTGRESQL_REPLICA_DB_HOST:
+        _read_engine = _create_engine(
+            get_database_url(
+                CONFIG_SETTINGS.POSTGRESQL_REPLICA_DB_HOST,
+                CONFIG_SETTINGS.POSTGRESQL_REPLICA_DB_PORT,
+            ),
+            echo,
+        )
+        _read_session_maker = async_sessionmaker(
+            _read_engine, expire_on_commit=False
+        )
+
     return _engine
 
 
+async def dispose_engine() -> None:
+    """Close every pooled connection and forget the engines."""
+    global _engine, _session_maker, _read_engine, _read_session_maker
+
+    for engine in (_engine, _read_engine):
+        if engine is not None:
+            await engine.dispose()
+    _engine = None
+    _session_maker = None
+    _read_engine = None
+    _read_session_maker = None
+
+
+def _engine_pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    pool = engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"status": pool.status()}
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Live usage of the connection pools (empty before the engine exists)."""
+    if _engine is None:
+        return {}
+    stats = _engine_pool_stats(_engine)
+    if _read_engine is not None:
+        stats["replica"] = _engine_pool_stats(_read_engine)
+    return stats
+
+
 def get_session_maker() -> async_sessionmaker[AsyncSession]:
     if _session_maker is None:
         init_engine()
     return _session_maker  # type: ignore[return-value]
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+def get_read_session_maker() -> async_sessionmaker[AsyncSession]:
+    """Replica session maker, or the primary one when no replica is set."""
+    if _session_maker is None:
+        init_engine()
+    return _read_session_maker or _session_maker  # type: ignore[return-value]
+
+
+async def gather_in_sessions(
+    *queries: Callable[[AsyncSession], Awaitable[Any]],
+    concurrency: int,
+    read_only: bool = True,
+) -> List[Any]:
+    """Run independent queries concurrently, each on its own pooled session.
+
+    At most `concurrency` sessions are open at once, so a single caller
+    cannot drain the pool. Results are returned in the order of `queries`.
+    """
+    session_maker = get_read_session_maker() if read_only else get_session_maker()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(query: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            async with session_maker() as session:
+                return await query(session)
+
+    return list(await asyncio.gather(*(run(query) for query in queries)))
+
+
+async def stream_partitions(
+    stmt: Select,
+    chunk_size: int | None = None,
+    read_only: bool = True,
+) -> AsyncIterator[Sequence[Any]]:
+    """Yield the scalar rows of `stmt` in chunks from a server-side cursor.
+
+    Runs on its own session, held only while the caller iterates, so it can
+    feed a `StreamingResponse` after the request's dependencies are closed.
+    At most `chunk_size` ORM objects are alive at a time.
+    """
+    chunk_size = chunk_size or CONFIG_SETTINGS.POSTGRESQL_STREAM_CHUNK_SIZE
+    session_maker = get_read_session_maker() if read_only else get_session_maker()
+    async with session_maker() as session:
+        result = await session.stream_scalars(
+            stmt.execution_options(yield_per=chunk_size)
+        )
+        async for partition in result.partitions():
+            yield partition
+            session.expunge_all()
+
+
+# ------------------------------------------------------------------
+# Read-your-writes stickiness
+# ------------------------------------------------------------------
+@event.listens_for(Session, "after_commit")
+def _mark_session_committed(session: Session) -> None:
+    session.info["committed"] = True
+
+
+def _client_key(request: Request) -> str | None:
+    """Identify the caller by its bearer token (no verification needed)."""
+    authorization = request.headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.sha1(authorization.encode()).hexdigest()
+
+
+def _mark_sticky(key: str) -> None:
+    now = time.monotonic()
+    if len(_sticky_clients) >= _STICKY_PRUNE_THRESHOLD:
+        for expired in [k for k, until in _sticky_clients.items() if until <= now]:
+            del _sticky_clients[expired]
+    _sticky_clients[key] = now + CONFIG_SETTINGS.POSTGRESQL_REPLICA_STICKY_SECONDS
+
+
+def _is_sticky(key: str | None) -> bool:
+    if key is None:
+        return False
+    until = _sticky_clients.get(key)
+    if until is None:
+        return False
+    if until <= time.monotonic():
+        _sticky_clients.pop(key, None)
+        return False
+    return True
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Primary (read-write) session.
+
+    A caller that commits is pinned to the primary for
+    `POSTGRESQL_REPLICA_STICKY_SECONDS`, so its next reads through
+    `get_read_db` see its own writes despite replication lag. The pin is
+    kept per worker process.
+    """
     session_maker = get_session_maker()
     async with session_maker() as session:
         try:
@@ -62,6 +235,24 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+        if _read_session_maker is not None and session.info.get("committed"):
+            key = _client_key(request)
+            if key is not None:
+                _mark_sticky(key)
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only handlers, served by the replica when configured."""
+    if _is_sticky(_client_key(request)):
+        session_maker = get_session_maker()
+    else:
+        session_maker = get_read_session_maker()
+    async with session_maker() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
 
 
 async def create_tables_and_get_names() -> List[str]:
@@ -80,6 +271,50 @@ async def create_tables_and_get_names() -> List[str]:
         )
 
 
+async def create_indexes_concurrently() -> List[str]:
+    """Create the indexes declared on the models without blocking writes.
+
+    Each index is built with `CREATE INDEX CONCURRENTLY IF NOT EXISTS` on an
+    autocommit connection. An index left INVALID by an interrupted build is
+    dropped and rebuilt first, since IF NOT EXISTS would otherwise skip it.
+    """
+    engine = init_engine()
+    messages = []
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        invalid = set(
+            (
+                await conn.execute(
+                    text(
+                        "SELECT c.relname FROM pg_index i "
+                        "JOIN pg_class c ON c.oid = i.indexrelid "
+                        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                        "WHERE NOT i.indisvalid AND n.nspname = 'public'"
+                    )
+                )
+            ).scalars()
+        )
+
+        for table in Base.metadata.sorted_tables:
+            for index in sorted(table.indexes, key=lambda idx: idx.name):
+                if index.name in invalid:
+                    await conn.execute(
+                        text(f'DROP INDEX CONCURRENTLY IF EXISTS public."{index.name}"')
+                    )
+                    messages.append(f"Dropped invalid index {index.name}")
+
+                options = index.dialect_options["postgresql"]
+                options["concurrently"] = True
+                try:
+                    await conn.execute(CreateIndex(index, if_not_exists=True))
+                finally:
+                    options["concurrently"] = False
+                messages.append(f"Ensured index {index.name}")
+
+    return messages
+
+
 def create_tables_sync_blocking() -> None:
     try:
         asyncio.run(create_tables_and_get_names())
@@ -0,0 +1,54 @@
+"""Application-wide async Redis client.
+
+One connection pool is shared by every user of Redis (token sessions, the
+dashboard cache, ...). It is opened by the FastAPI lifespan hook and closed
+on shutdown; `get_redis()` creates it on demand for scripts.
+"""
+from __future__ import annotations
+
+from redis.asyncio import BlockingConnectionPool, Redis
+
+from app.config import CONFIG_SETTINGS
+
+_pool: BlockingConnectionPool | None = None
+_redis: Redis | None = None
+
+
+def init_redis() -> Redis:
+    """Build the client and its pool from the `REDIS_*` settings."""
+    global _pool, _redis
+
+    if _redis is None:
+        _pool = BlockingConnectionPool(
+            host=CONFIG_SETTINGS.REDIS_DB_HOST,
+            port=CONFIG_SETTINGS.REDIS_PORT,
+            db=CONFIG_SETTINGS.REDIS_DB,
+            password=CONFIG_SETTINGS.REDIS_PASS,
+            decode_responses=True,
+            max_connections=CONFIG_SETTINGS.REDIS_MAX_CONNECTIONS,
+            timeout=CONFIG_SETTINGS.REDIS_POOL_TIMEOUT,
+            socket_timeout=CONFIG_SETTINGS.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=CONFIG_SETTINGS.REDIS_SOCKET_CONNECT_TIMEOUT,
+            health_check_interval=CONFIG_SETTINGS.REDIS_HEALTH_CHECK_INTERVAL,
+        )
+        _redis = Redis(connection_pool=_pool)
+
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close every pooled connection and forget the client."""
+    global _pool, _redis
+
+    if _redis is not None:
+        await _redis.aclose()
+    if _pool is not None:
+        await _pool.aclose()
+    _pool = None
+    _redis = None
+
+
+def get_redis() -> Redis:
+    if _redis is None:
+        return init_redis()
+    return _redis
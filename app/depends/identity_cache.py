@@ -0,0 +1,106 @@
+"""Per-worker cache of the user identity checked on every request.
+
+`get_current_user` only needs a user's id, role and active flag, so these
+are kept in memory for `USER_IDENTITY_CACHE_TTL_SECONDS`. Changes to a user
+evict the entry locally and are broadcast over Redis pub/sub so every other
+worker evicts it too; the TTL bounds staleness if a message is missed.
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from app.config import CONFIG_SETTINGS
+from app.database.redis import get_redis
+from app.models.main.users import TblUsers, UserRole
+from app.utils.cache_utils import TTLCache
+from app.utils.schemas_utils import CustomModel
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "user_identity:invalidate"
+_RECONNECT_DELAY_SECONDS = 1.0
+# Poll interval of the subscription; must stay below REDIS_SOCKET_TIMEOUT,
+# which otherwise fails the blocking read of an idle channel
+_POLL_SECONDS = 1.0
+
+
+class UserIdentity(CustomModel):
+    """What request handlers need to know about the authenticated user."""
+
+    usr_id: int
+    uuid: str
+    username: str
+    email: Optional[str] = None
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: TblUsers) -> "UserIdentity":
+        return cls(
+            usr_id=user.usr_id,
+            uuid=user.uuid,
+            username=user.username,
+            email=user.email,
+            role=user.role,
+            is_active=user.is_active,
+        )
+
+
+class UserIdentityCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries: TTLCache[UserIdentity] = TTLCache(maxsize, ttl)
+        self._task: asyncio.Task | None = None
+
+    def get(self, uuid: str) -> Optional[UserIdentity]:
+        return self.entries.get(uuid)
+
+    def set(self, identity: UserIdentity) -> None:
+        self.entries.set(identity.uuid, identity)
+
+    async def invalidate(self, uuid: str) -> None:
+        """Evict `uuid` here and on every other worker."""
+        self.entries.pop(uuid)
+        try:
+            await get_redis().publish(INVALIDATION_CHANNEL, uuid)
+        except RedisError:
+            logger.warning("User identity invalidation for %s not broadcast", uuid)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with get_redis().pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    # Messages may have been missed while unsubscribed
+                    self.entries.clear()
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=_POLL_SECONDS
+                        )
+                        if message is not None:
+                            self.entries.pop(message["data"])
+            except RedisError:
+                logger.warning("User identity invalidation channel lost")
+                self.entries.clear()
+                await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+
+
+identity_cache = UserIdentityCache(
+    maxsize=CONFIG_SETTINGS.USER_IDENTITY_CACHE_SIZE,
+    ttl=CONFIG_SETTINGS.USER_IDENTITY_CACHE_TTL_SECONDS,
+)
@@ -1,42 +1,135 @@
+import hashlib
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
+from typing import Dict, Set
 
 import jwt
 from fastapi import Depends, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from redis.asyncio import Redis
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import CONFIG_SETTINGS
-from app.database.postgresql import get_db
+from app.database.postgresql import get_session_maker
+from app.database.redis import get_redis
+from app.depends.identity_cache import UserIdentity, identity_cache
+from app.depends.revocation_filter import (
+    CHANNEL as ACCESS_SESSIONS_CHANNEL,
+    INDEX_KEY as ACCESS_SESSIONS_KEY,
+    encode_entry,
+    revocation_filter,
+)
+from app.depends.session_store import SessionStore, SessionStoreUnavailable
 from app.models.main.users import TblUsers
+from app.utils.cache_utils import TTLCache
+from app.utils.jwt_keys import JWTKeyRing
 from app.utils.schemas_utils import CustomHTTPException, JWTPayloadSchema
 
 
+# Atomic refresh-token rotation. Returns 1 when rotated, 0 when the token is
+# not the user's current refresh token (revoked, expired or superseded by a
+# newer login) and -1 when an already rotated token is presented again, in
+# which case the whole session is revoked. Either way the user's current
+# access token is recorded in the access session index (see
+# revocation_filter).
+#   KEYS: refresh:{uuid}, refresh_jti:{old}, refresh_used:{old},
+#         access:{uuid}, jti:{new access}, refresh_jti:{new refresh},
+#         access session index
+#   ARGV: presented token, uuid, new access, access ttl,
+#         new refresh, refresh ttl, remaining ttl of the presented token,
+#         index entry after rotation, index entry after revocation,
+#         index channel
+ROTATE_REFRESH_LUA = """
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    redis.call('DEL', KEYS[1], KEYS[4])
+    redis.call('HSET', KEYS[7], ARGV[2], ARGV[9])
+    redis.call('PUBLISH', ARGV[10], ARGV[2] .. '|' .. ARGV[9])
+    return -1
+end
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[2])
+redis.call('SET', KEYS[3], '1', 'EX', ARGV[7])
+redis.call('SET', KEYS[4], ARGV[3], 'EX', ARGV[4])
+redis.call('SET', KEYS[5], ARGV[2], 'EX', ARGV[4])
+redis.call('SET', KEYS[1], ARGV[5], 'EX', ARGV[6])
+redis.call('SET', KEYS[6], ARGV[2], 'EX', ARGV[6])
+redis.call('HSET', KEYS[7], ARGV[2], ARGV[8])
+redis.call('PUBLISH', ARGV[10], ARGV[2] .. '|' .. ARGV[8])
+return 1
+"""
+
+
+# Revokes a user's session: drops the active tokens and records "no current
+# access token" in the access session index. Queued while Redis is down and
+# possibly replayed late, so it first checks the index: an entry issued
+# after the revocation (its expiry minus one access token lifetime is past
+# the revocation time) belongs to a newer login, which is left alone.
+#   KEYS: access:{uuid}, refresh:{uuid}, access session index
+#   ARGV: uuid, revocation time, access ttl, index entry, index channel
+REVOKE_USER_LUA = """
+local current = redis.call('HGET', KEYS[3], ARGV[1])
+if current then
+    local expires_at = tonumber(string.match(current, '|(%d+)$'))
+    if expires_at and expires_at - tonumber(ARGV[3]) > tonumber(ARGV[2]) then
+        return 0
+    end
+end
+redis.call('DEL', KEYS[1], KEYS[2])
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[4])
+redis.call('PUBLISH', ARGV[5], ARGV[1] .. '|' .. ARGV[4])
+return 1
+"""
+
+
 class JWTService:
     def __init__(self):
-        self.redis = Redis(
-            host=CONFIG_SETTINGS.REDIS_DB_HOST,
-            port=CONFIG_SETTINGS.REDIS_PORT,
-            db=CONFIG_SETTINGS.REDIS_DB,
-            password=CONFIG_SETTINGS.REDIS_PASS,
-            decode_responses=True,
-        )
-        self.private_key = CONFIG_SETTINGS.APP_JWT_PRIVATE_KEY.replace("\\n", "\n")
-        self.public_key = CONFIG_SETTINGS.APP_JWT_PUBLIC_KEY.replace("\\n", "\n")
         self.issuer = CONFIG_SETTINGS.PROJECT_NAME
         self.audience = "api"
+        self._keys: JWTKeyRing | None = None
+        # sha256(token) -> (claims, payload) of recently verified access
+        # tokens, plus the digests held per user so revoke_user can purge them;
+        # the index shrinks as cache entries are evicted, so both stay bounded
+        self._verified: TTLCache[tuple[dict, JWTPayloadSchema]] = TTLCache(
+            CONFIG_SETTINGS.VERIFIED_TOKEN_CACHE_SIZE,
+            CONFIG_SETTINGS.VERIFIED_TOKEN_CACHE_TTL_SECONDS,
+            on_evict=self._unindex_verified,
+        )
+        self._verified_by_user: Dict[str, Set[bytes]] = {}
+        self._rotate_script = None
+        self.sessions = SessionStore()
+
+    def load_keys(self) -> JWTKeyRing:
+        """Parse the configured keys (once; called at startup)."""
+        if self._keys is None:
+            self._keys = JWTKeyRing(
+                kid=CONFIG_SETTINGS.APP_JWT_KEY_ID,
+                private_pem=CONFIG_SETTINGS.APP_JWT_PRIVATE_KEY,
+                public_pem=CONFIG_SETTINGS.APP_JWT_PUBLIC_KEY,
+                algorithm=CONFIG_SETTINGS.ALGORITHM,
+                retired_public_pems=CONFIG_SETTINGS.APP_JWT_RETIRED_PUBLIC_KEYS,
+            )
+        return self._keys
+
+    @property
+    def redis(self) -> Redis:
+        # Shared application pool, owned by the lifespan hook
+        return get_redis()
 
     def _now(self):
         return datetime.now(timezone.utc)
 
-    def _generate_payload(self, request_uuid: str, expire_minutes: int, role: str):
+    def _generate_payload(
+        self, request_uuid: str, expire_minutes: int, role: str, kind: str
+    ):
         jti = uuid.uuid4().hex
         expire = self._now() + timedelta(minutes=expire_minutes)
 
         return {
             "uuid": request_uuid,
             "role": role,
+            "typ": kind,
             "iss": self.issuer,
             "aud": self.audience,
             "iat": int(self._now().timestamp()),
@@ -44,79 +137,162 @@ class JWTService:
             "jti": jti,
         }
 
+    def _encode(self, uuid: str, role: str, kind: str):
+        expire_minutes = (
+            CONFIG_SETTINGS.ACCESS_TOKEN_EXPIRE_MINUTES
+            if kind == "access"
+            else CONFIG_SETTINGS.REFRESH_TOKEN_EXPIRE_MINUTES
+        )
+        payload = self._generate_payload(uuid, expire_minutes, role, kind)
+        token = self.load_keys().encode(payload)
+        return token, payload["jti"], expire_minutes * 60
+
+    @staticmethod
+    def _current_access(uuid: str, jti: str, expires_at: float) -> list:
+        """Ops recording `jti` as the user's current access token; the other
+        workers pick it up from the broadcast."""
+        entry = encode_entry(jti, expires_at)
+        return [
+            ("hset", ACCESS_SESSIONS_KEY, uuid, entry),
+            ("publish", ACCESS_SESSIONS_CHANNEL, f"{uuid}|{entry}"),
+        ]
+
+    async def _issue(self, uuid: str, role: str, *kinds: str) -> list[str]:
+        tokens, ops, current = [], [], None
+        for kind in kinds:
+            token, jti, ttl = self._encode(uuid, role, kind)
+            # Active token per user and its JTI
+            jti_prefix = "jti" if kind == "access" else "refresh_jti"
+            ops.append(("set", f"{kind}:{uuid}", token, ttl))
+            ops.append(("set", f"{jti_prefix}:{jti}", uuid, ttl))
+            if kind == "access":
+                current = (jti, time.time() + ttl)
+                ops += self._current_access(uuid, *current)
+            tokens.append(token)
+        # One MULTI/EXEC round trip. Never queued: replayed late, it could
+        # overwrite a session the user has since opened through another worker
+        try:
+            await self.sessions.write(ops)
+        except SessionStoreUnavailable:
+            raise self._session_store_down()
+        if current is not None:
+            revocation_filter.apply(uuid, *current)
+        return tokens
+
     # ===============================
     # CREATE ACCESS TOKEN
     # ===============================
     async def create_access_token(self, uuid: str, role: str) -> str:
-
-        payload = self._generate_payload(
-            uuid, CONFIG_SETTINGS.ACCESS_TOKEN_EXPIRE_MINUTES, role
-        )
-
-        token = jwt.encode(payload, self.private_key, algorithm="RS256")
-
-        # Store active token
-        await self.redis.setex(
-            f"access:{uuid}",
-            CONFIG_SETTINGS.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            token,
-        )
-
-        # Store JTI
-        await self.redis.setex(
-            f"jti:{payload['jti']}",
-            CONFIG_SETTINGS.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
-            uuid,
-        )
-
-        return token
+        (access,) = await self._issue(uuid, role, "access")
+        return access
 
     # ===============================
     # CREATE REFRESH TOKEN
     # ===============================
     async def create_refresh_token(self, uuid: str, role: str) -> str:
+        (refresh,) = await self._issue(uuid, role, "refresh")
+        return refresh
 
-        payload = self._generate_payload(
-            uuid, CONFIG_SETTINGS.REFRESH_TOKEN_EXPIRE_MINUTES, role
-        )
-
-        token = jwt.encode(payload, self.private_key, algorithm="RS256")
-
-        await self.redis.setex(
-            f"refresh:{uuid}",
-            CONFIG_SETTINGS.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
-            token,
-        )
-
-        await self.redis.setex(
-            f"refresh_jti:{payload['jti']}",
-            CONFIG_SETTINGS.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
-            uuid,
-        )
-
-        return token
+    # ===============================
+    # CREATE ACCESS + REFRESH TOKENS
+    # ===============================
+    async def create_token_pair(self, uuid: str, role: str) -> tuple[str, str]:
+        access, refresh = await self._issue(uuid, role, "access", "refresh")
+        return access, refresh
+
+    @staticmethod
+    def _token_kind(claims: dict) -> str:
+        """"access" or "refresh"; tokens issued before the `typ` claim are
+        told apart by their lifetime."""
+        if "typ" in claims:
+            return claims["typ"]
+        access_lifetime = CONFIG_SETTINGS.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        if claims["exp"] - claims["iat"] <= access_lifetime:
+            return "access"
+        return "refresh"
 
     # ===============================
     # VERIFY ACCESS TOKEN
     # ===============================
-    async def verify_access_token(self, token: str) -> JWTPayloadSchema:
+    def _decode_access_token(self, token: str) -> tuple[dict, JWTPayloadSchema]:
+        """Signature/claims check, skipped for recently verified tokens.
+
+        Entries never outlive the token's `exp`; the Redis session checks in
+        `verify_access_token` still run on every request.
+        """
+        digest = hashlib.sha256(token.encode()).digest()
+        cached = self._verified.get(digest)
+        if cached is not None:
+            return cached
 
         try:
-            payload = jwt.decode(
-                token,
-                self.public_key,
-                algorithms=["RS256"],
-                issuer=self.issuer,
-                audience=self.audience,
+            claims = self.load_keys().decode(
+                token, issuer=self.issuer, audience=self.audience
             )
         except jwt.PyJWTError:
             raise CustomHTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 message="Invalid or expired token",
             )
+        # A refresh token must never pass as a bearer token, least of all
+        # in degraded mode where the session store is not consulted
+        if self._token_kind(claims) != "access":
+            raise CustomHTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="Invalid or expired token",
+            )
+
+        verified = (claims, JWTPayloadSchema(**claims))
+        ttl = claims["exp"] - time.time()
+        if ttl > 0:
+            self._verified.set(digest, verified, ttl=ttl)
+            self._verified_by_user.setdefault(claims["uuid"], set()).add(digest)
+        return verified
+
+    def _unindex_verified(self, digest: bytes, verified: tuple) -> None:
+        uuid = verified[0]["uuid"]
+        digests = self._verified_by_user.get(uuid)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._verified_by_user[uuid]
+
+    def _forget_verified(self, uuid: str) -> None:
+        for digest in self._verified_by_user.pop(uuid, ()):
+            self._verified.pop(digest)
+
+    @staticmethod
+    def _session_store_down() -> CustomHTTPException:
+        return CustomHTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            message="Session store unavailable, please retry",
+        )
+
+    async def verify_access_token(self, token: str) -> JWTPayloadSchema:
+
+        payload, verified_payload = self._decode_access_token(token)
+
+        # The user's current token, as far as this worker knows: no Redis
+        if revocation_filter.is_current(payload["uuid"], payload["jti"]):
+            return verified_payload
+
+        # Possibly revoked or superseded: active token and JTI in one round trip
+        seen = revocation_filter.entry(payload["uuid"])
+        try:
+            stored, jti = await self.sessions.mget(
+                f"access:{payload['uuid']}", f"jti:{payload['jti']}"
+            )
+        except SessionStoreUnavailable:
+            # Degraded mode: signature and expiry were checked above; honour
+            # the revocations this worker knows about and let the rest in
+            if self.sessions.is_revoked(payload["uuid"], payload["iat"]):
+                raise CustomHTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    message="Token revoked",
+                )
+            return verified_payload
 
         # Check if active token
-        stored = await self.redis.get(f"access:{payload['uuid']}")
         if stored != token:
             raise CustomHTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -124,7 +300,6 @@ class JWTService:
             )
 
         # Check JTI
-        jti = await self.redis.get(f"jti:{payload['jti']}")
         if not jti:
             raise CustomHTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -132,28 +307,41 @@ class JWTService:
             )
         print("payload configured successfully : ", payload)
 
-        return JWTPayloadSchema(**payload)
+        # Confirmed current; later requests with this token stay local
+        revocation_filter.confirm(
+            payload["uuid"], payload["jti"], payload["exp"], seen
+        )
+        return verified_payload
 
     # ===============================
     # VERIFY REFRESH TOKEN
     # ===============================
-    async def verify_refresh_token(self, token: str) -> JWTPayloadSchema:
-
+    def _decode_refresh_token(self, token: str) -> dict:
         try:
-            payload = jwt.decode(
-                token,
-                self.public_key,
-                algorithms=["RS256"],
-                issuer=self.issuer,
-                audience=self.audience,
+            claims = self.load_keys().decode(
+                token, issuer=self.issuer, audience=self.audience
             )
         except jwt.PyJWTError:
             raise CustomHTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 message="Invalid refresh token",
             )
+        if self._token_kind(claims) != "refresh":
+            raise CustomHTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="Invalid refresh token",
+            )
+        return claims
 
-        stored = await self.redis.get(f"refresh:{payload['uuid']}")
+    async def verify_refresh_token(self, token: str) -> JWTPayloadSchema:
+
+        payload = self._decode_refresh_token(token)
+
+        try:
+            (stored,) = await self.sessions.mget(f"refresh:{payload['uuid']}")
+        except SessionStoreUnavailable:
+            # Refresh tokens are long-lived; never accept them unchecked
+            raise self._session_store_down()
         if stored != token:
             raise CustomHTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -162,13 +350,104 @@ class JWTService:
 
         return JWTPayloadSchema(**payload)
 
+    # ===============================
+    # ROTATE REFRESH TOKEN
+    # ===============================
+    async def rotate_refresh_token(self, token: str) -> tuple[str, str]:
+        """Exchange a refresh token for a new access + refresh token pair.
+
+        The swap happens in one Lua script, so a refresh token can be
+        redeemed only once; presenting it again revokes the session.
+        """
+        payload = self._decode_refresh_token(token)
+        uuid, old_jti = payload["uuid"], payload["jti"]
+
+        access, access_jti, access_ttl = self._encode(uuid, payload["role"], "access")
+        refresh, refresh_jti, refresh_ttl = self._encode(
+            uuid, payload["role"], "refresh"
+        )
+        remaining_ttl = max(int(payload["exp"] - time.time()), 1)
+        now = time.time()
+        rotated_entry = encode_entry(access_jti, now + access_ttl)
+        revoked_entry = encode_entry("", now + access_ttl)
+
+        if self._rotate_script is None:
+            self._rotate_script = self.redis.register_script(ROTATE_REFRESH_LUA)
+        keys = [
+            f"refresh:{uuid}",
+            f"refresh_jti:{old_jti}",
+            f"refresh_used:{old_jti}",
+            f"access:{uuid}",
+            f"jti:{access_jti}",
+            f"refresh_jti:{refresh_jti}",
+            ACCESS_SESSIONS_KEY,
+        ]
+        args = [
+            token,
+            uuid,
+            access,
+            access_ttl,
+            refresh,
+            refresh_ttl,
+            remaining_ttl,
+            rotated_entry,
+            revoked_entry,
+            ACCESS_SESSIONS_CHANNEL,
+        ]
+        try:
+            result = await self.sessions.run(
+                lambda: self._rotate_script(keys=keys, args=args, client=self.redis)
+            )
+        except SessionStoreUnavailable:
+            raise self._session_store_down()
+
+        if result == -1:
+            revocation_filter.apply(uuid, "", now + access_ttl)
+            self._forget_verified(uuid)
+            raise CustomHTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="Refresh token reuse detected",
+            )
+        if result != 1:
+            raise CustomHTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                message="Refresh token revoked",
+            )
+
+        # The previous access token is no longer the active one
+        revocation_filter.apply(uuid, access_jti, now + access_ttl)
+        self._forget_verified(uuid)
+        return access, refresh
+
     # ===============================
     # REVOKE USER TOKENS
     # ===============================
     async def revoke_user(self, uuid: str):
 
-        await self.redis.delete(f"access:{uuid}")
-        await self.redis.delete(f"refresh:{uuid}")
+        # Recorded locally first so degraded verification rejects the
+        # user's tokens even if the revocation below has to be queued
+        self.sessions.revoke(uuid)
+        self._forget_verified(uuid)
+        now = time.time()
+        access_ttl = CONFIG_SETTINGS.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        revocation_filter.apply(uuid, "", now + access_ttl)
+        await self.sessions.write(
+            [
+                (
+                    "eval",
+                    REVOKE_USER_LUA,
+                    (f"access:{uuid}", f"refresh:{uuid}", ACCESS_SESSIONS_KEY),
+                    (
+                        uuid,
+                        now,
+                        access_ttl,
+                        encode_entry("", now + access_ttl),
+                        ACCESS_SESSIONS_CHANNEL,
+                    ),
+                )
+            ],
+            queue=True,
+        )
 
 
 security = HTTPBearer()
@@ -177,11 +456,10 @@ jwt_service = JWTService()
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db),
-):
+) -> UserIdentity:
     """
     Extract and validate access token.
-    Return full user object.
+    Return the user's identity (id, role, active flag).
     """
 
     token = credentials.credentials
@@ -189,11 +467,15 @@ async def get_current_user(
     # 1️⃣ Verify JWT (signature, exp, redis session, jti)
     payload = await jwt_service.verify_access_token(token)
 
-    # 2️⃣ Fetch user from DB
-    user = await TblUsers.get_by_id(payload.uuid, db)
-
-    if not user:
-        raise CustomHTTPException(status_code=401, message="User not found")
+    # 2️⃣ Identity from the in-process cache, DB only on a miss
+    user = identity_cache.get(payload.uuid)
+    if user is None:
+        async with get_session_maker()() as db:
+            row = await TblUsers.get_by_id(payload.uuid, db)
+        if not row:
+            raise CustomHTTPException(status_code=401, message="User not found")
+        user = UserIdentity.from_user(row)
+        identity_cache.set(user)
 
     if not user.is_active:
         raise CustomHTTPException(status_code=403, message="Inactive user")
@@ -0,0 +1,166 @@
+"""Per-worker view of each user's current access token.
+
+A user has one valid access token at a time: a new login or refresh
+supersedes the previous token, and `revoke_user` leaves none. Every such
+change is recorded in the `INDEX_KEY` hash (uuid -> "<jti>|<expires_at>",
+empty jti after a revocation) and broadcast on `CHANNEL`, in the same
+MULTI/EXEC (or Lua script) that updates the token keys themselves.
+
+Each worker mirrors the hash in memory, so `verify_access_token` can
+accept a user's current token without touching Redis. Anything else -- an
+older token, a user without an entry, a worker that is not in sync -- is a
+possible revocation and is settled against Redis as before. An entry lives
+as long as the token it names (or one access token lifetime after a
+revocation); past that, every token it could reject has expired.
+
+Changes reach other workers within pub/sub latency; a missed message is
+repaired by the resync on reconnect and every `REVOCATION_RESYNC_SECONDS`.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from app.config import CONFIG_SETTINGS
+from app.database.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "access_sessions"
+CHANNEL = "access_sessions:changed"
+_RECONNECT_DELAY_SECONDS = 1.0
+# Must stay below REDIS_SOCKET_TIMEOUT (see identity_cache)
+_POLL_SECONDS = 1.0
+
+
+def encode_entry(jti: str, expires_at: float) -> str:
+    return f"{jti}|{int(expires_at)}"
+
+
+def _decode_entry(value: str) -> Tuple[str, float]:
+    jti, expires_at = value.rsplit("|", 1)
+    return jti, float(expires_at)
+
+
+class RevocationFilter:
+    def __init__(self, resync_interval: float):
+        self.resync_interval = resync_interval
+        # uuid -> (current access jti, or "" when revoked; expiry)
+        self._current: Dict[str, Tuple[str, float]] = {}
+        self.live = False
+        self._task: asyncio.Task | None = None
+
+        self.local_hits = 0
+        self.redis_checks = 0
+        self.resyncs = 0
+
+    def is_current(self, uuid: str, jti: str) -> bool:
+        """True only if `jti` is known to be the user's current token.
+
+        False means "ask Redis": the token may be revoked or superseded, or
+        this worker may simply not have heard about it yet.
+        """
+        if self.live:
+            entry = self._current.get(uuid)
+            if entry is not None:
+                current, expires_at = entry
+                if expires_at <= time.time():
+                    del self._current[uuid]
+                elif current == jti:
+                    self.local_hits += 1
+                    return True
+        self.redis_checks += 1
+        return False
+
+    def apply(self, uuid: str, jti: str, expires_at: float) -> None:
+        """Record locally that `jti` (or no token, if empty) is current."""
+        self._current[uuid] = (jti, expires_at)
+
+    def entry(self, uuid: str) -> Optional[Tuple[str, float]]:
+        return self._current.get(uuid)
+
+    def confirm(
+        self,
+        uuid: str,
+        jti: str,
+        expires_at: float,
+        seen: Optional[Tuple[str, float]],
+    ) -> None:
+        """`apply` a token Redis just vouched for, unless the entry changed
+        (e.g. a revocation arrived) since `seen` was read before asking."""
+        if self._current.get(uuid) is seen:
+            self._current[uuid] = (jti, expires_at)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self.live = False
+
+    async def _resync(self) -> None:
+        redis = get_redis()
+        now = time.time()
+        current, expired = {}, []
+        for uuid, value in (await redis.hgetall(INDEX_KEY)).items():
+            jti, expires_at = _decode_entry(value)
+            if expires_at > now:
+                current[uuid] = (jti, expires_at)
+            else:
+                expired.append(uuid)
+        if expired:
+            await redis.hdel(INDEX_KEY, *expired)
+        self._current = current
+        self.resyncs += 1
+
+    def _on_message(self, data: str) -> None:
+        uuid, value = data.split("|", 1)
+        jti, expires_at = _decode_entry(value)
+        self.apply(uuid, jti, expires_at)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with get_redis().pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    # Subscribed first, so nothing after the snapshot is lost
+                    await self._resync()
+                    self.live = True
+                    next_resync = time.monotonic() + self.resync_interval
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=_POLL_SECONDS
+                        )
+                        if message is not None:
+                            self._on_message(message["data"])
+                        if time.monotonic() >= next_resync:
+                            await self._resync()
+                            next_resync = time.monotonic() + self.resync_interval
+            except RedisError:
+                logger.warning("Access session channel lost; using Redis per request")
+                self.live = False
+                await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "live": self.live,
+            "entries": len(self._current),
+            "local_hits": self.local_hits,
+            "redis_checks": self.redis_checks,
+            "resyncs": self.resyncs,
+        }
+
+
+revocation_filter = RevocationFilter(
+    resync_interval=CONFIG_SETTINGS.REVOCATION_RESYNC_SECONDS,
+)
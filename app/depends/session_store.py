@@ -0,0 +1,211 @@
+"""Redis token-session store behind a circuit breaker.
+
+Every session read/write goes through `SessionStore.run`, which bounds the
+call with `REDIS_SESSION_TIMEOUT_SECONDS` and fails fast while the breaker
+is open. Callers decide how to degrade:
+
+* verification falls back to the token signature and expiry, plus the
+  revocations this worker recorded locally (`is_revoked`);
+* issuing tokens fails (`write` raises), since a write replayed later
+  could overwrite a session created meanwhile through another worker;
+* revocations are queued (`write(..., queue=True)`) and replayed, latest
+  op per target, once the breaker closes again. They are "eval" ops whose
+  script re-checks at replay time that they do not undo a newer session.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from redis.exceptions import RedisError
+
+from app.config import CONFIG_SETTINGS
+from app.database.redis import get_redis
+from app.utils.cache_utils import TTLCache
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# ("set", key, value, ttl_seconds), ("del", key),
+# ("hset", key, field, value), ("publish", channel, message)
+# or ("eval", lua_script, keys, args)
+SessionOp = Tuple[Any, ...]
+
+_REPLAY_BATCH_SIZE = 500
+
+
+def _target(op: SessionOp) -> Hashable:
+    """What an op overwrites; a queued op is superseded by a later one."""
+    if op[0] in ("set", "del"):
+        return op[1]
+    if op[0] == "eval":
+        return ("eval", *op[2])
+    return op[:3]
+
+
+class SessionStoreUnavailable(Exception):
+    """Redis did not answer in time, failed, or the breaker is open."""
+
+
+class SessionStore:
+    def __init__(self):
+        self.breaker = CircuitBreaker(
+            "redis-sessions",
+            failure_threshold=CONFIG_SETTINGS.REDIS_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=CONFIG_SETTINGS.REDIS_BREAKER_RESET_SECONDS,
+            call_timeout=CONFIG_SETTINGS.REDIS_SESSION_TIMEOUT_SECONDS,
+            errors=(RedisError, OSError),
+            on_close=self._schedule_replay,
+        )
+        # uuid -> wall-clock time of the revocation; kept for the lifetime of
+        # the longest token so degraded verification can still honour it
+        self._revocations: TTLCache[float] = TTLCache(
+            CONFIG_SETTINGS.REDIS_LOCAL_REVOCATIONS_SIZE,
+            CONFIG_SETTINGS.REFRESH_TOKEN_EXPIRE_MINUTES * 60,
+        )
+        # op target -> (op, wall-clock expiry of a "set")
+        self._pending: "OrderedDict[Hashable, Tuple[SessionOp, float]]" = (
+            OrderedDict()
+        )
+        self._replay_task: asyncio.Task | None = None
+        self.dropped_writes = 0
+
+    @property
+    def redis(self):
+        return get_redis()
+
+    @property
+    def healthy(self) -> bool:
+        return self.breaker.state == "closed"
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        try:
+            return await self.breaker.call(fn)
+        except (CircuitOpenError, RedisError, OSError, asyncio.TimeoutError) as exc:
+            raise SessionStoreUnavailable(str(exc)) from exc
+
+    async def write(self, ops: List[SessionOp], queue: bool = False) -> None:
+        """Apply `ops` in one MULTI/EXEC.
+
+        Raises SessionStoreUnavailable, or with `queue` keeps the ops for
+        replay instead; only queue ops that are safe to apply late.
+        """
+        for op in ops:
+            self._pending.pop(_target(op), None)  # superseded by this write
+        try:
+            await self.run(lambda: self._apply(ops))
+        except SessionStoreUnavailable:
+            if not queue:
+                raise
+            self._queue(ops)
+
+    async def mget(self, *keys: str) -> List[Optional[str]]:
+        """MGET that also sees writes still waiting to be replayed.
+
+        Keys a queued "eval" op touches read as missing: the op may clear
+        them when it is replayed.
+        """
+        values = await self.run(lambda: self.redis.mget(*keys))
+        if not self._pending:
+            return values
+        now = time.time()
+        cleared = {
+            key
+            for op, _ in self._pending.values()
+            if op[0] == "eval"
+            for key in op[2]
+        }
+        for i, key in enumerate(keys):
+            entry = self._pending.get(key)
+            if entry is not None:
+                op, expires_at = entry
+                values[i] = op[2] if op[0] == "set" and expires_at > now else None
+            elif key in cleared:
+                values[i] = None
+        return values
+
+    # ------------------------------------------------------------------
+    # Local revocation list
+    # ------------------------------------------------------------------
+    def revoke(self, uuid: str) -> None:
+        self._revocations.set(uuid, time.time())
+
+    def is_revoked(self, uuid: str, issued_at: float) -> bool:
+        revoked_at = self._revocations.get(uuid)
+        return revoked_at is not None and issued_at <= revoked_at
+
+    # ------------------------------------------------------------------
+    # Pending writes
+    # ------------------------------------------------------------------
+    async def _apply(self, ops: List[SessionOp]) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for op in ops:
+                if op[0] == "set":
+                    pipe.setex(op[1], op[3], op[2])
+                elif op[0] == "del":
+                    pipe.delete(op[1])
+                elif op[0] == "hset":
+                    pipe.hset(op[1], op[2], op[3])
+                elif op[0] == "eval":
+                    pipe.eval(op[1], len(op[2]), *op[2], *op[3])
+                else:
+                    pipe.publish(op[1], op[2])
+            await pipe.execute()
+
+    def _queue(self, ops: List[SessionOp]) -> None:
+        now = time.time()
+        for op in ops:
+            target = _target(op)
+            self._pending.pop(target, None)  # latest write per target wins
+            expires_at = now + op[3] if op[0] == "set" else float("inf")
+            self._pending[target] = (op, expires_at)
+        while len(self._pending) > CONFIG_SETTINGS.REDIS_PENDING_WRITES_MAX:
+            self._pending.popitem(last=False)
+            self.dropped_writes += 1
+
+    def _schedule_replay(self) -> None:
+        if self._pending and (self._replay_task is None or self._replay_task.done()):
+            self._replay_task = asyncio.ensure_future(self._replay())
+
+    async def _replay(self) -> None:
+        replayed = 0
+        while self._pending:
+            batch = list(self._pending.items())[:_REPLAY_BATCH_SIZE]
+            now = time.time()
+            ops: List[SessionOp] = []
+            for _, (op, expires_at) in batch:
+                if op[0] != "set":
+                    ops.append(op)
+                elif expires_at > now:
+                    ops.append(("set", op[1], op[2], max(int(expires_at - now), 1)))
+            try:
+                await self.run(lambda: self._apply(ops))
+            except SessionStoreUnavailable:
+                return  # retried when the breaker closes again
+            for key, entry in batch:
+                # Keep entries re-queued while the batch was in flight
+                if self._pending.get(key) is entry:
+                    del self._pending[key]
+            replayed += len(ops)
+        logger.info("Replayed %d queued session writes", replayed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.breaker.snapshot(),
+            "pending_writes": len(self._pending),
+            "dropped_writes": self.dropped_writes,
+            "local_revocations": len(self._revocations),
+        }
@@ -2,18 +2,34 @@
 
 from fastapi import FastAPI
 from app.api import api_router
+from app.api.notifications.dispatcher import outbox_dispatcher
 from app.config import CONFIG_SETTINGS
+from app.database.postgresql import dispose_engine, init_engine
+from app.database.redis import close_redis, init_redis
+from app.depends.identity_cache import identity_cache
+from app.depends.jwt_depends import jwt_service
+from app.depends.revocation_filter import revocation_filter
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # perform startup actions here
+    jwt_service.load_keys()
+    init_engine()
+    init_redis()
+    outbox_dispatcher.start()
+    identity_cache.start()
+    revocation_filter.start()
     try:
         yield
     finally:
         # perform shutdown actions here
-        pass
+        await revocation_filter.stop()
+        await identity_cache.stop()
+        await outbox_dispatcher.stop()
+        await dispose_engine()
+        await close_redis()
 
 
 app = FastAPI(
@@ -1,8 +1,10 @@
 
 
-from typing import Any, Dict
+from typing import Any, Dict, TypeVar
 
-from sqlalchemy import MetaData
+from pydantic import BaseModel
+from sqlalchemy import MetaData, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import as_declarative
 
 
@@ -28,6 +30,8 @@ POSTGRES_INDEXES_NAMING_CONVENTION = {
 
 class_registry: Dict[str, Any] = {}
 
+ModelT = TypeVar("ModelT", bound="Base")
+
 
 @as_declarative(class_registry=class_registry)
 class Base:
@@ -51,6 +55,23 @@ class Base:
     # Apply the PostgreSQL-friendly naming convention to metadata
     metadata = MetaData(naming_convention=POSTGRES_INDEXES_NAMING_CONVENTION)
 
+    @classmethod
+    async def create(
+        cls: type[ModelT], data: BaseModel, db: AsyncSession
+    ) -> ModelT:
+        """Insert one row from `data` and return it as a persistent instance.
+
+        Uses a single INSERT ... RETURNING, so primary keys, uuids and other
+        column defaults come back in the same round trip; no flush/refresh
+        is needed before or after the caller commits.
+        """
+        stmt = (
+            insert(cls)
+            .values(**data.model_dump(exclude_unset=True))
+            .returning(cls)
+        )
+        return await db.scalar(stmt)
+
     def __repr__(self) -> str:  # pragma: no cover - trivial
         pk = getattr(self, "id", getattr(self, "record_id", None))
         return f"<{self.__class__.__name__} id={pk!r}>"
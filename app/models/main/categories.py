@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import ForeignKey, Integer, String, Text, func, select
+from sqlalchemy import ForeignKey, Index, Integer, String, Text, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -12,7 +12,7 @@ class CategoryBaseModel(CustomModel):
     cat_id: Optional[int] = None
     name: Optional[str] = None
     restaurant_id: Optional[int] = None
-    image_data: Optional[str] = None
+    image_digest: Optional[str] = None
     description: Optional[str] = None
 
 
@@ -32,20 +32,19 @@ class TblCategories(Base):
         nullable=False,
     )
 
-    image_data: Mapped[Optional[str]] = mapped_column("cat_image", Text, nullable=True)
+    # SHA-256 of the image in the blob store (app.database.blob_store); the
+    # legacy inline `cat_image` column is emptied by the migration
+    image_digest: Mapped[Optional[str]] = mapped_column(
+        "cat_image_digest", String(64), nullable=True
+    )
     description: Mapped[Optional[str]] = mapped_column(
         "cat_description", Text, nullable=True
     )
 
-    @classmethod
-    async def create(cls, data: CategoryBaseModel, db: AsyncSession):
-        category = cls(**data.model_dump(exclude_unset=True))
-        db.add(category)
-        await db.flush()
-        await db.refresh(category)
-        return category
-
     @classmethod
     async def active_categories_count(cls, db: AsyncSession):
         result = await db.scalar(select(func.count(cls.cat_id)))
         return result or 0
+
+
+Index("ix_tbl_categories_restaurant_id", TblCategories.restaurant_id)
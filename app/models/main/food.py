@@ -1,6 +1,15 @@
 from typing import Optional
 
-from sqlalchemy import Boolean, Float, ForeignKey, Integer, String, Text, func, select
+from sqlalchemy import (
+    Boolean,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+    select,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -14,7 +23,7 @@ class FoodSBaseModel(CustomModel):
     price: Optional[float] = None
     category_id: Optional[int] = None
     is_available: Optional[bool] = True
-    image_data: Optional[str] = None
+    image_digest: Optional[str] = None
 
 
 class TblFoods(Base):
@@ -39,7 +48,11 @@ class TblFoods(Base):
         "food_isAvailable", Boolean, default=True, nullable=False
     )
 
-    image_data: Mapped[Optional[str]] = mapped_column("food_image", Text, nullable=True)
+    # SHA-256 of the image in the blob store (app.database.blob_store); the
+    # legacy inline `food_image` column is emptied by the migration
+    image_digest: Mapped[Optional[str]] = mapped_column(
+        "food_image_digest", String(64), nullable=True
+    )
 
     # -------------------------
     # Queries
@@ -54,17 +67,12 @@ class TblFoods(Base):
         result = await db.execute(select(cls).where(cls.food_id.in_(food_ids)))
         return result.scalars().all()
 
-    @classmethod
-    async def create(cls, data: FoodSBaseModel, db: AsyncSession):
-        food = cls(**data.model_dump(exclude_unset=True))
-        db.add(food)
-        await db.flush()
-        await db.refresh(food)
-        return food
-
     @classmethod
     async def active_foods_count(cls, db: AsyncSession):
         result = await db.scalar(
             select(func.count(cls.food_id)).where(cls.is_available)
         )
         return result or 0
+
+
+Index("ix_tbl_foods_category_id", TblFoods.category_id)
@@ -7,9 +7,13 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
+    delete,
     func,
+    insert,
+    literal,
     select,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -76,15 +80,6 @@ class TblNotifications(Base):
     user = relationship("TblUsers", foreign_keys=[user_id], backref="notifications")
     related_user = relationship("TblUsers", foreign_keys=[related_user_id])
 
-    @classmethod
-    async def create(
-        cls, data: NotificationBaseModel, db: AsyncSession
-    ) -> "TblNotifications":
-        notification = cls(**data.model_dump(exclude_unset=True))
-        db.add(notification)
-        await db.flush()
-        return notification
-
     @classmethod
     async def mark_as_read(cls, notif_id: int, db: AsyncSession):
         result = await db.execute(select(cls).where(cls.notif_id == notif_id))
@@ -131,3 +126,118 @@ class TblNotifications(Base):
         stmt = stmt.order_by(cls.created_at.desc()).limit(limit)
         result = await db.execute(stmt)
         return result.scalars().all()
+
+
+# Notification feed per recipient (NULL recipient = admins), newest first
+Index(
+    "ix_tbl_notifications_user_id_created_at",
+    TblNotifications.user_id,
+    TblNotifications.created_at.desc(),
+)
+# Unread badge count: only unread rows are indexed
+Index(
+    "ix_tbl_notifications_user_id_unread",
+    TblNotifications.user_id,
+    postgresql_where=TblNotifications.is_read.is_(False),
+)
+
+
+class TblNotificationOutbox(Base):
+    """Notifications waiting to be delivered into `tbl_notifications`.
+
+    Rows are added in the same transaction as the change that caused them
+    and moved by the outbox dispatcher, so a committed write never fails or
+    pays an extra commit because of its notification.
+    """
+
+    __tablename__ = "tbl_notification_outbox"
+    __table_args__ = {"schema": "public"}
+
+    outbox_id: Mapped[int] = mapped_column(
+        "obx_id", Integer, primary_key=True, autoincrement=True
+    )
+
+    user_id: Mapped[Optional[int]] = mapped_column(
+        "obx_user_id",
+        ForeignKey("public.tbl_users.usr_id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
+    related_user_id: Mapped[Optional[int]] = mapped_column(
+        "obx_related_user_id",
+        ForeignKey("public.tbl_users.usr_id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
+    title: Mapped[str] = mapped_column("obx_title", String(255), nullable=False)
+    message: Mapped[str] = mapped_column("obx_message", String(1000), nullable=False)
+
+    type: Mapped[NotificationType] = mapped_column(
+        "obx_type",
+        Enum(NotificationType, name="notification_type", native_enum=False, length=50),
+        nullable=False,
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        "obx_createdAt", DateTime, default=datetime.utcnow, nullable=False
+    )
+
+    @classmethod
+    def enqueue(cls, data: NotificationBaseModel, db: AsyncSession) -> None:
+        """Add a pending notification to the caller's unit of work."""
+        db.add(cls(**data.model_dump(exclude_unset=True, exclude={"is_read"})))
+        db.info["notification_outbox"] = True
+
+    @classmethod
+    async def dispatch_batch(cls, db: AsyncSession, limit: int = 100) -> int:
+        """Move up to `limit` pending rows into `tbl_notifications`.
+
+        Runs as a single statement (DELETE ... RETURNING feeding an
+        INSERT ... SELECT); `SKIP LOCKED` lets several workers dispatch
+        concurrently without handing out the same row twice.
+        """
+        pending = (
+            select(cls.outbox_id)
+            .order_by(cls.outbox_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(cls)
+            .where(cls.outbox_id.in_(pending.scalar_subquery()))
+            .returning(
+                cls.user_id,
+                cls.related_user_id,
+                cls.title,
+                cls.message,
+                cls.type,
+                cls.created_at,
+            )
+            .cte("moved")
+        )
+        stmt = (
+            insert(TblNotifications)
+            .from_select(
+                [
+                    TblNotifications.user_id,
+                    TblNotifications.related_user_id,
+                    TblNotifications.title,
+                    TblNotifications.message,
+                    TblNotifications.type,
+                    TblNotifications.created_at,
+                    TblNotifications.is_read,
+                ],
+                select(
+                    moved.c.user_id,
+                    moved.c.related_user_id,
+                    moved.c.title,
+                    moved.c.message,
+                    moved.c.type,
+                    moved.c.created_at,
+                    literal(False),
+                ),
+            )
+            .returning(TblNotifications.notif_id)
+        )
+        result = await db.execute(stmt)
+        return len(result.all())
@@ -1,5 +1,6 @@
 import enum
-from datetime import datetime
+import random
+from datetime import datetime, timedelta
 from typing import Optional
 from uuid import uuid4
 
@@ -8,14 +9,31 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    Row,
+    SmallInteger,
     String,
+    Text,
+    bindparam,
+    cast,
+    delete,
+    func,
+    insert,
+    literal_column,
     select,
+    text,
+    true,
+    union_all,
 )
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.config import CONFIG_SETTINGS
 from app.models.base_class import Base
+from app.models.main.users import TblUsers
 from app.utils.schemas_utils import CustomModel
 
 
@@ -96,12 +114,96 @@ class TblOrders(Base):
     )
 
     @classmethod
-    async def create(cls, data: OrderSBaseModel, db: AsyncSession) -> "TblOrders":
-        order = cls(**data.model_dump(exclude_unset=True))
-        db.add(order)
-        await db.flush()
-        await db.refresh(order)
-        return order
+    async def create_with_items(
+        cls, data: OrderSBaseModel, items: list[dict], db: AsyncSession
+    ) -> Row:
+        """Insert an order, all of its lines and its first history entry.
+
+        Runs as one statement regardless of the number of lines: the order
+        row is inserted with RETURNING in a CTE, and the item rows (fed from
+        `unnest` over array parameters) and the status history row are
+        inserted from it, and the hourly rollup is bumped alongside. Returns
+        the generated order columns.
+        """
+        now = datetime.utcnow()
+        new_order = (
+            insert(cls)
+            .values(
+                uuid=str(uuid4()),
+                user_id=data.user_id,
+                total_amount=data.total_amount,
+                status=data.status,
+                created_at=now,
+                updated_at=now,
+            )
+            .returning(
+                cls.ord_id,
+                cls.uuid,
+                cls.user_id,
+                cls.total_amount,
+                cls.status,
+                cls.created_at,
+            )
+            .cte("new_order")
+        )
+
+        lines = func.unnest(
+            bindparam("food_ids", [i["food_id"] for i in items], ARRAY(Integer)),
+            bindparam("food_names", [i["food_name"] for i in items], ARRAY(String)),
+            bindparam(
+                "category_ids", [i["category_id"] for i in items], ARRAY(Integer)
+            ),
+            bindparam("quantities", [i["quantity"] for i in items], ARRAY(Integer)),
+            bindparam("prices", [i["price"] for i in items], ARRAY(Float)),
+        ).table_valued("food_id", "food_name", "category_id", "quantity", "price")
+
+        new_items = (
+            insert(TblOrderItems)
+            .from_select(
+                [
+                    TblOrderItems.order_id,
+                    TblOrderItems.food_id,
+                    TblOrderItems.food_name,
+                    TblOrderItems.category_id,
+                    TblOrderItems.quantity,
+                    TblOrderItems.price,
+                ],
+                select(
+                    new_order.c.ord_id,
+                    lines.c.food_id,
+                    lines.c.food_name,
+                    lines.c.category_id,
+                    lines.c.quantity,
+                    lines.c.price,
+                ).select_from(new_order.join(lines, true())),
+            )
+            .cte("new_items")
+        )
+
+        new_history = (
+            insert(TblOrderStatusHistory)
+            .from_select(
+                [
+                    TblOrderStatusHistory.order_id,
+                    TblOrderStatusHistory.status,
+                    TblOrderStatusHistory.created_at,
+                ],
+                select(new_order.c.ord_id, new_order.c.status, new_order.c.created_at),
+            )
+            .cte("new_history")
+        )
+
+        new_rollup = TblOrderRollupHourly.upsert_stmt(
+            [(now, data.status, 1, data.total_amount)],
+            TblOrderRollupHourly.pick_shard(),
+        ).cte("new_rollup")
+
+        stmt = select(new_order).add_cte(new_items, new_history, new_rollup)
+        result = await db.execute(stmt)
+        # The writes run inside a SELECT, which the session's write tracking
+        # does not see; flag them for app.api.admin.dashboard_cache
+        db.info["dashboard_stale"] = True
+        return result.one()
 
     @classmethod
     async def get_by_uuid(
@@ -111,49 +213,85 @@ class TblOrders(Base):
         return result.scalar_one_or_none()
 
     @classmethod
-    async def get_dashboard_order_stats(cls, db: AsyncSession):
-        from sqlalchemy import func
-
-        stmt = select(
-            cls.status,
-            func.count(cls.ord_id),
-            func.sum(cls.total_amount),
-        ).group_by(cls.status)
-        result = await db.execute(stmt)
-        return result.all()
-
-    @classmethod
-    async def get_stats_in_range(
-        cls, db: AsyncSession, start_date: datetime, end_date: datetime = None
-    ):
-        from sqlalchemy import func
-
-        stmt = select(func.count(cls.ord_id), func.sum(cls.total_amount)).where(
-            cls.created_at >= start_date
+    async def get_detail_json(
+        cls,
+        db: AsyncSession,
+        ord_uuid: str,
+        user_id: Optional[int] = None,
+        with_history: bool = False,
+    ) -> Optional[str]:
+        """Order detail rendered as JSON by PostgreSQL in one statement.
+
+        The object matches `OrderResponseModel` (or
+        `OrderTrackingResponseModel` with `with_history`) serialized with
+        camelCase aliases, so it can be sent as-is without ORM hydration.
+        Returns None when no order matches.
+        """
+        empty = literal_column("'[]'::json")
+
+        item = func.json_build_object(
+            "foodId", TblOrderItems.food_id,
+            "foodName", func.coalesce(
+                TblOrderItems.food_name, cast(TblOrderItems.food_id, Text)
+            ),
+            "categoryId", TblOrderItems.category_id,
+            "quantity", TblOrderItems.quantity,
+            "price", TblOrderItems.price,
+        )
+        items = (
+            select(
+                func.coalesce(
+                    func.json_agg(aggregate_order_by(item, TblOrderItems.item_id)),
+                    empty,
+                )
+            )
+            .where(TblOrderItems.order_id == cls.ord_id)
+            .scalar_subquery()
         )
-        if end_date:
-            stmt = stmt.where(cls.created_at < end_date)
-        result = await db.execute(stmt)
-        return result.one()
 
-    @classmethod
-    async def get_timeseries_stats(
-        cls, db: AsyncSession, interval: str, start_date: datetime
-    ):
-        from sqlalchemy import func
+        fields = [
+            "uuid", cls.uuid,
+            "userId", cls.user_id,
+            "userName", TblUsers.username,
+            "totalAmount", cls.total_amount,
+            "status", cls.status,
+            "createdAt", cls.created_at,
+            "items", items,
+        ]
+
+        if with_history:
+            entry = func.json_build_object(
+                "status", TblOrderStatusHistory.status,
+                "createdAt", TblOrderStatusHistory.created_at,
+            )
+            history = (
+                select(
+                    func.coalesce(
+                        func.json_agg(
+                            aggregate_order_by(
+                                entry,
+                                TblOrderStatusHistory.created_at,
+                                TblOrderStatusHistory.history_id,
+                            )
+                        ),
+                        empty,
+                    )
+                )
+                .where(TblOrderStatusHistory.order_id == cls.ord_id)
+                .scalar_subquery()
+            )
+            fields += ["statusHistory", history]
 
         stmt = (
-            select(
-                func.date_trunc(interval, cls.created_at).label("bucket"),
-                func.count(cls.ord_id),
-                func.sum(cls.total_amount),
-            )
-            .where(cls.created_at >= start_date)
-            .group_by("bucket")
-            .order_by("bucket")
+            select(cast(func.json_build_object(*fields), Text))
+            .select_from(cls)
+            .outerjoin(TblUsers, TblUsers.usr_id == cls.user_id)
+            .where(cls.uuid == ord_uuid)
         )
-        result = await db.execute(stmt)
-        return result.all()
+        if user_id is not None:
+            stmt = stmt.where(cls.user_id == user_id)
+
+        return await db.scalar(stmt)
 
     @classmethod
     async def get_recent_orders(cls, db: AsyncSession, limit: int = 5):
@@ -162,6 +300,27 @@ class TblOrders(Base):
         return result.scalars().all()
 
 
+# ===============================
+# Indexes
+# ===============================
+# Customer order history: filter by user, keyset-paginate newest first.
+# Also serves every other lookup by ord_user_id.
+Index(
+    "ix_tbl_orders_user_id_created_at",
+    TblOrders.user_id,
+    TblOrders.created_at.desc(),
+    TblOrders.ord_id.desc(),
+)
+# Dashboard ranges/timeseries and recent orders
+Index("ix_tbl_orders_created_at", TblOrders.created_at.desc())
+# Admin order list filtered by status, newest first
+Index(
+    "ix_tbl_orders_status_created_at",
+    TblOrders.status,
+    TblOrders.created_at.desc(),
+)
+
+
 class TblOrderItems(Base):
     __tablename__ = "tbl_order_items"
     __table_args__ = {"schema": "public"}
@@ -176,10 +335,22 @@ class TblOrderItems(Base):
         nullable=False,
     )
 
-    food_id: Mapped[int] = mapped_column(
+    # Cleared, not cascaded, when the food (or its category) is deleted:
+    # past orders keep their lines through the snapshot below
+    food_id: Mapped[Optional[int]] = mapped_column(
         "item_food_id",
-        ForeignKey("public.tbl_foods.food_id", ondelete="CASCADE"),
-        nullable=False,
+        ForeignKey("public.tbl_foods.food_id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    # Snapshot of the food at order time, so order reads need no catalog
+    # lookup and history stays stable when the catalog changes
+    food_name: Mapped[Optional[str]] = mapped_column(
+        "item_food_name", String(200), nullable=True
+    )
+
+    category_id: Mapped[Optional[int]] = mapped_column(
+        "item_category_id", Integer, nullable=True
     )
 
     quantity: Mapped[int] = mapped_column(
@@ -218,3 +389,228 @@ class TblOrderStatusHistory(Base):
 
     # Relationship back to order
     order = relationship("TblOrders", back_populates="status_history")
+
+
+Index("ix_tbl_order_items_order_id", TblOrderItems.order_id)
+Index("ix_tbl_order_status_history_order_id", TblOrderStatusHistory.order_id)
+
+
+class TblOrderRollupHourly(Base):
+    """Order count and revenue per creation hour and current status.
+
+    Kept up to date in the same transaction as the order writes (create,
+    status change, removal with the owning user), so dashboard aggregates
+    read a few thousand rollup rows instead of scanning `tbl_orders`. A
+    status change moves the order between status rows of the hour it was
+    created in, so every order is counted exactly once.
+
+    Each (hour, status) is split over `ORDER_ROLLUP_SHARDS` rows, and every
+    write picks one at random: the upsert holds its row lock until commit,
+    so with a single row all orders created in the same hour would queue
+    behind each other. Reads sum the shards; a single shard may go negative.
+    """
+
+    __tablename__ = "tbl_order_rollup_hourly"
+    __table_args__ = {"schema": "public"}
+
+    bucket: Mapped[datetime] = mapped_column(
+        "rlp_bucket", DateTime, primary_key=True
+    )
+
+    status: Mapped[OrderStatus] = mapped_column(
+        "rlp_status",
+        Enum(OrderStatus, name="order_status", native_enum=False, length=50),
+        primary_key=True,
+    )
+
+    shard: Mapped[int] = mapped_column(
+        "rlp_shard", SmallInteger, primary_key=True, default=0, server_default="0"
+    )
+
+    order_count: Mapped[int] = mapped_column(
+        "rlp_order_count", Integer, nullable=False, default=0
+    )
+
+    revenue: Mapped[float] = mapped_column(
+        "rlp_revenue", Float, nullable=False, default=0.0
+    )
+
+    @staticmethod
+    def hour_of(moment: datetime) -> datetime:
+        return moment.replace(minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def pick_shard() -> int:
+        return random.randrange(CONFIG_SETTINGS.ORDER_ROLLUP_SHARDS)
+
+    @classmethod
+    def _accumulate(cls, stmt):
+        """Make an INSERT into the rollup add onto existing hourly rows."""
+        return stmt.on_conflict_do_update(
+            index_elements=[cls.bucket, cls.status, cls.shard],
+            set_={
+                "rlp_order_count": cls.order_count + stmt.excluded.rlp_order_count,
+                "rlp_revenue": cls.revenue + stmt.excluded.rlp_revenue,
+            },
+        )
+
+    @classmethod
+    def upsert_stmt(
+        cls, deltas: list[tuple[datetime, OrderStatus, int, float]], shard: int = 0
+    ):
+        """Add `(created_at, status, count, revenue)` deltas onto their hourly
+        rows of `shard`. Deltas must hit distinct rows.
+
+        Rows are written (and locked) in (hour, status) order, so two
+        transactions touching the same rows cannot deadlock.
+        """
+        rows = sorted(
+            (
+                {
+                    "bucket": cls.hour_of(created_at),
+                    "status": status,
+                    "shard": shard,
+                    "order_count": count,
+                    "revenue": revenue,
+                }
+                for created_at, status, count, revenue in deltas
+            ),
+            key=lambda row: (row["bucket"], row["status"].value),
+        )
+        return cls._accumulate(pg_insert(cls).values(rows))
+
+    @classmethod
+    async def move_status(
+        cls,
+        db: AsyncSession,
+        created_at: datetime,
+        amount: float,
+        old_status: OrderStatus,
+        new_status: OrderStatus,
+    ) -> None:
+        if old_status == new_status:
+            return
+        await db.execute(
+            cls.upsert_stmt(
+                [
+                    (created_at, old_status, -1, -amount),
+                    (created_at, new_status, 1, amount),
+                ],
+                cls.pick_shard(),
+            )
+        )
+
+    @classmethod
+    async def remove_user_orders(cls, db: AsyncSession, user_id: int) -> None:
+        """Subtract a user's orders ahead of their cascading delete."""
+        bucket = func.date_trunc("hour", TblOrders.created_at)
+        removed = (
+            select(
+                bucket,
+                TblOrders.status,
+                -func.count(TblOrders.ord_id),
+                -func.sum(TblOrders.total_amount),
+            )
+            .where(TblOrders.user_id == user_id)
+            .group_by(bucket, TblOrders.status)
+        )
+        await db.execute(
+            cls._accumulate(
+                pg_insert(cls).from_select(
+                    [cls.bucket, cls.status, cls.order_count, cls.revenue], removed
+                )
+            )
+        )
+
+    @classmethod
+    async def rebuild(cls, db: AsyncSession) -> int:
+        """Recompute every rollup row from `tbl_orders`.
+
+        Blocks order writes (SHARE lock) for the duration of the transaction
+        so no increment is lost between the scan and the swap.
+        """
+        await db.execute(text("LOCK TABLE public.tbl_orders IN SHARE MODE"))
+        await db.execute(delete(cls))
+        bucket = func.date_trunc("hour", TblOrders.created_at)
+        result = await db.execute(
+            insert(cls).from_select(
+                [cls.bucket, cls.status, cls.order_count, cls.revenue],
+                select(
+                    bucket,
+                    TblOrders.status,
+                    func.count(TblOrders.ord_id),
+                    func.coalesce(func.sum(TblOrders.total_amount), 0.0),
+                ).group_by(bucket, TblOrders.status),
+            )
+        )
+        return result.rowcount
+
+    @classmethod
+    async def get_status_stats(cls, db: AsyncSession):
+        """`(status, count, revenue)` over all orders."""
+        stmt = (
+            select(cls.status, func.sum(cls.order_count), func.sum(cls.revenue))
+            .group_by(cls.status)
+            .having(func.sum(cls.order_count) > 0)
+        )
+        result = await db.execute(stmt)
+        return result.all()
+
+    @classmethod
+    async def get_stats_in_range(
+        cls, db: AsyncSession, start_date: datetime, end_date: datetime = None
+    ):
+        """`(count, revenue)` of orders created in `[start_date, end_date)`.
+
+        Whole hours come from the rollup; the partial hours at either end
+        of an unaligned range are read from `tbl_orders` directly.
+        """
+        first_full = cls.hour_of(start_date)
+        if first_full < start_date:
+            first_full += timedelta(hours=1)
+        end_full = cls.hour_of(end_date) if end_date else None
+
+        rollup = select(
+            cls.order_count.label("orders"), cls.revenue.label("revenue")
+        ).where(cls.bucket >= first_full)
+        if end_full:
+            rollup = rollup.where(cls.bucket < end_full)
+
+        parts = [rollup]
+        edges = []
+        if start_date < first_full:
+            edges.append((start_date, min(first_full, end_date or first_full)))
+        if end_full and end_full < end_date and end_full >= first_full:
+            edges.append((end_full, end_date))
+        for low, high in edges:
+            parts.append(
+                select(
+                    literal_column("1").label("orders"),
+                    TblOrders.total_amount.label("revenue"),
+                ).where(TblOrders.created_at >= low, TblOrders.created_at < high)
+            )
+
+        combined = union_all(*parts).subquery()
+        stmt = select(
+            func.coalesce(func.sum(combined.c.orders), 0),
+            func.sum(combined.c.revenue),
+        )
+        result = await db.execute(stmt)
+        return result.one()
+
+    @classmethod
+    async def get_timeseries_stats(
+        cls, db: AsyncSession, interval: str, start_date: datetime
+    ):
+        """`(bucket, count, revenue)` per `interval` (day, week, month, ...)
+        from `start_date` on, truncated to the hour."""
+        bucket = func.date_trunc(interval, cls.bucket).label("bucket")
+        stmt = (
+            select(bucket, func.sum(cls.order_count), func.sum(cls.revenue))
+            .where(cls.bucket >= cls.hour_of(start_date))
+            .group_by(bucket)
+            .having(func.sum(cls.order_count) > 0)
+            .order_by(bucket)
+        )
+        result = await db.execute(stmt)
+        return result.all()
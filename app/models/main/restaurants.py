@@ -52,14 +52,6 @@ class TblRestaurants(Base):
         "res_createdAt", DateTime, default=datetime.utcnow, nullable=False
     )
 
-    @classmethod
-    async def create(cls, data: RestaurantBaseModel, db: AsyncSession):
-        restaurant = cls(**data.model_dump(exclude_unset=True))
-        db.add(restaurant)
-        await db.flush()
-        await db.refresh(restaurant)
-        return restaurant
-
     @classmethod
     async def active_restaurants_count(cls, db: AsyncSession):
         result = await db.scalar(select(func.count(cls.res_id)).where(cls.is_active))
@@ -24,6 +24,7 @@ class UsersBaseModel(CustomModel):
     username: Optional[str] = None
     email: Optional[str] = None
     hashed_password: Optional[str] = None
+    role: Optional[UserRole] = None
     is_active: Optional[bool] = True
 
 
@@ -94,18 +95,6 @@ class TblUsers(Base):
         nullable=False,
     )
 
-    # ===============================
-    # Create User
-    # ===============================
-    @classmethod
-    async def create(cls, data: UsersBaseModel, db: AsyncSession) -> "TblUsers":
-
-        user = cls(**data.model_dump(exclude_unset=True))
-        db.add(user)
-        await db.flush()
-        await db.refresh(user)
-        return user
-
     # ===============================
     # Get By Username
     # ===============================
@@ -0,0 +1,119 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The protected dependency is considered down; the call was not made."""
+
+
+class CircuitBreaker:
+    """Fails fast on a dependency after repeated errors or timeouts.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    calls are rejected with `CircuitOpenError` for `reset_timeout` seconds.
+    Then one trial call is let through (half-open): success closes the
+    circuit, failure opens it again. Every call is bounded by `call_timeout`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        reset_timeout: float,
+        call_timeout: float,
+        errors: Tuple[Type[BaseException], ...] = (Exception,),
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.call_timeout = call_timeout
+        self.errors = errors + (asyncio.TimeoutError,)
+        self.on_close = on_close
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+        self.last_error: Optional[str] = None
+
+    def allow(self) -> bool:
+        """Whether a call may go through now (claims the half-open trial)."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = HALF_OPEN
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        if not self.allow():
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} circuit is open")
+
+        self.calls += 1
+        try:
+            result = await asyncio.wait_for(fn(), self.call_timeout)
+        except self.errors as exc:
+            self._record_failure(exc)
+            raise
+        except BaseException:
+            self._trial_in_flight = False
+            raise
+        self._record_success()
+        return result
+
+    def _record_success(self) -> None:
+        was_open = self.state != CLOSED
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        if was_open and self.on_close is not None:
+            self.on_close()
+
+    def _record_failure(self, exc: BaseException) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = f"{type(exc).__name__}: {exc}"[:200]
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or (
+            self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_for_seconds": (
+                round(time.monotonic() - self.opened_at, 3)
+                if self.opened_at is not None
+                else None
+            ),
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+            "last_error": self.last_error,
+        }
@@ -1,46 +1,153 @@
-import os
+import asyncio
 import base64
-from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Tuple, TypeVar
+
 from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+from fastapi import status
 
+from app.config import CONFIG_SETTINGS
+from app.utils.schemas_utils import CustomHTTPException
+
+T = TypeVar("T")
+
+# Hashes are stored as "$scrypt$v=1$n=..,r=..,p=..$<salt>$<key>" (base64), so
+# the parameters can be raised later without invalidating existing hashes.
+# Hashes from before versioning are bare base64(salt + key) with these:
+LEGACY_SCRYPT_PARAMS = (2**14, 8, 1)
+HASH_PREFIX = "$scrypt$v=1$"
+SALT_LENGTH = 16
+KEY_LENGTH = 32
 
-def hash_password(password: str) -> str:
-    """Securely hash password using Scrypt."""
 
-    salt = os.urandom(16)  # ✅ random salt
+class PasswordHasherBusy(CustomHTTPException):
+    """No hashing slot freed up within `PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS`."""
 
-    kdf = Scrypt(
-        salt=salt,
-        length=32,
-        n=2**14,
-        r=8,
-        p=1,
-        backend=default_backend()
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            message="Too many sign-in requests, please retry shortly",
+        )
+
+
+def _current_params() -> Tuple[int, int, int]:
+    return (
+        CONFIG_SETTINGS.PASSWORD_SCRYPT_N,
+        CONFIG_SETTINGS.PASSWORD_SCRYPT_R,
+        CONFIG_SETTINGS.PASSWORD_SCRYPT_P,
     )
 
-    key = kdf.derive(password.encode())
 
-    return base64.b64encode(salt + key).decode()
+def _scrypt(salt: bytes, n: int, r: int, p: int) -> Scrypt:
+    return Scrypt(
+        salt=salt, length=KEY_LENGTH, n=n, r=r, p=p, backend=default_backend()
+    )
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password."""
+def _parse(hashed_password: str) -> Tuple[Tuple[int, int, int], bytes, bytes]:
+    """(params, salt, key) of a stored hash, versioned or legacy."""
+    if hashed_password.startswith(HASH_PREFIX):
+        params, salt, key = hashed_password[len(HASH_PREFIX):].split("$")
+        values = dict(item.split("=") for item in params.split(","))
+        return (
+            (int(values["n"]), int(values["r"]), int(values["p"])),
+            base64.b64decode(salt),
+            base64.b64decode(key),
+        )
 
     decoded = base64.b64decode(hashed_password)
-    salt = decoded[:16]
-    stored_key = decoded[16:]
-
-    kdf = Scrypt(
-        salt=salt,
-        length=32,
-        n=2**14,
-        r=8,
-        p=1,
-        backend=default_backend()
+    return LEGACY_SCRYPT_PARAMS, decoded[:SALT_LENGTH], decoded[SALT_LENGTH:]
+
+
+def hash_password(password: str) -> str:
+    """Securely hash password using Scrypt."""
+
+    salt = os.urandom(SALT_LENGTH)  # ✅ random salt
+    n, r, p = _current_params()
+
+    key = _scrypt(salt, n, r, p).derive(password.encode())
+
+    return (
+        f"{HASH_PREFIX}n={n},r={r},p={p}$"
+        f"{base64.b64encode(salt).decode()}${base64.b64encode(key).decode()}"
     )
 
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify password."""
+
     try:
-        kdf.verify(plain_password.encode(), stored_key)
+        (n, r, p), salt, stored_key = _parse(hashed_password)
+        _scrypt(salt, n, r, p).verify(plain_password.encode(), stored_key)
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when the hash predates the configured format or parameters."""
+    try:
+        params, _, _ = _parse(hashed_password)
+    except Exception:
+        return False
+    return (
+        not hashed_password.startswith(HASH_PREFIX) or params != _current_params()
+    )
+
+
+# ------------------------------------------------------------------
+# Off-loop hashing with admission control
+# ------------------------------------------------------------------
+# scrypt releases the GIL inside OpenSSL, so a thread pool gives real
+# parallelism. At most PASSWORD_HASH_CONCURRENCY hashes run at once; callers
+# wait up to PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS for a slot and are then
+# turned away, so a login storm cannot monopolise the workers.
+_executor = ThreadPoolExecutor(
+    max_workers=CONFIG_SETTINGS.PASSWORD_HASH_CONCURRENCY,
+    thread_name_prefix="password-hash",
+)
+_slots: asyncio.Semaphore | None = None
+
+
+async def _run_hasher(fn: Callable[..., T], *args) -> T:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(CONFIG_SETTINGS.PASSWORD_HASH_CONCURRENCY)
+
+    try:
+        await asyncio.wait_for(
+            _slots.acquire(), CONFIG_SETTINGS.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS
+        )
+    except asyncio.TimeoutError:
+        raise PasswordHasherBusy()
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    finally:
+        _slots.release()
+
+
+async def hash_password_async(password: str) -> str:
+    """`hash_password` on the hashing pool. Raises `PasswordHasherBusy`."""
+    return await _run_hasher(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """`verify_password` on the hashing pool. Raises `PasswordHasherBusy`."""
+    return await _run_hasher(verify_password, plain_password, hashed_password)
+
+
+async def rehash_if_needed(plain_password: str, hashed_password: str) -> str | None:
+    """New hash for a just-verified password whose stored hash is outdated.
+
+    Returns None when no upgrade is due, or when the pool is busy (the
+    upgrade is then simply retried on a later login).
+    """
+    if not needs_rehash(hashed_password):
+        return None
+    try:
+        return await hash_password_async(plain_password)
+    except PasswordHasherBusy:
+        return None
@@ -0,0 +1,29 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque keyset cursor pointing just after `(created_at, row_id)`."""
+
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+# Keyset columns are a naive DateTime and an int4 primary key
+_ROW_ID_MIN, _ROW_ID_MAX = -(2**31), 2**31 - 1
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of `encode_cursor`. Raises ValueError on malformed input,
+    including values the database would reject when binding them."""
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        created_at, row_id = datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if created_at.tzinfo is not None or not _ROW_ID_MIN <= row_id <= _ROW_ID_MAX:
+        raise ValueError("Invalid cursor")
+    return created_at, row_id
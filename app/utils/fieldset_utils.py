@@ -0,0 +1,115 @@
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Set, Type
+
+from pydantic import BaseModel
+from pydantic.alias_generators import to_snake
+from sqlalchemy.orm import load_only
+
+
+def _parse_csv(value: Optional[str]) -> Optional[Set[str]]:
+    if value is None:
+        return None
+    return {to_snake(part.strip()) for part in value.split(",") if part.strip()}
+
+
+class FieldSet:
+    """`fields=` and `expand=` of a list request, checked against `model`.
+
+    `fields` names the scalar response fields to return (camelCase or
+    snake_case; default: all). `expand` names the relations to embed
+    (default: all of `expandable`, as before; an empty `expand=` embeds
+    none). `expandable` maps each relation to the response fields it fills,
+    and `sources` maps response fields to the row attribute they are read
+    from when the names differ.
+
+    Raises ValueError for names the model does not have, or for an empty
+    `fields=`.
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        fields: Optional[str] = None,
+        expand: Optional[str] = None,
+        expandable: Mapping[str, Sequence[str]] | None = None,
+        sources: Mapping[str, str] | None = None,
+    ):
+        self.model = model
+        self.expandable = dict(expandable or {})
+        self.sources = dict(sources or {})
+
+        relation_fields = {f for names in self.expandable.values() for f in names}
+        self.all_fields = [
+            name
+            for name, info in {
+                **model.model_fields,
+                **model.model_computed_fields,
+            }.items()
+            if name not in relation_fields and not getattr(info, "exclude", False)
+        ]
+
+        requested = _parse_csv(fields)
+        if requested is not None:
+            if not requested:
+                raise ValueError("No fields requested")
+            unknown = requested - set(self.all_fields)
+            if unknown:
+                raise ValueError(f"Unknown fields: {sorted(unknown)}")
+        self.fields = [
+            f for f in self.all_fields if requested is None or f in requested
+        ]
+
+        expansions = _parse_csv(expand)
+        if expansions is not None:
+            unknown = expansions - set(self.expandable)
+            if unknown:
+                raise ValueError(f"Unknown expansions: {sorted(unknown)}")
+        self.expand = set(self.expandable) if expansions is None else expansions
+
+        self.sparse = len(self.fields) < len(self.all_fields) or (
+            len(self.expand) < len(self.expandable)
+        )
+
+    def wants(self, relation: str) -> bool:
+        return relation in self.expand
+
+    @property
+    def attributes(self) -> list[str]:
+        """Row attributes backing the requested scalar fields."""
+        return [self.sources.get(f, f) for f in self.fields]
+
+    def load_only(self, entity: Any, *always: Any):
+        """Loader option fetching only the requested columns (plus `always`)."""
+        return load_only(*(getattr(entity, a) for a in self.attributes), *always)
+
+    @property
+    def include(self) -> Optional[Set[str]]:
+        """Serializer `include` for one item; None when nothing is dropped."""
+        if not self.sparse:
+            return None
+        included = set(self.fields)
+        for relation in self.expand:
+            included.update(self.expandable[relation])
+        return included
+
+    @property
+    def include_items(self) -> Optional[Dict[Any, Any]]:
+        """`include` for a plain list of items."""
+        return {"__all__": self.include} if self.sparse else None
+
+    def include_in(self, key: str, *siblings: str) -> Optional[Dict[str, Any]]:
+        """`include` for a container whose `key` holds a list of items."""
+        if not self.sparse:
+            return None
+        return {key: {"__all__": self.include}, **{s: True for s in siblings}}
+
+    def build(self, values: Dict[str, Any]) -> BaseModel:
+        """Model from `values`; validated unless fields were left out."""
+        if self.sparse:
+            return self.model.model_construct(**values)
+        return self.model.model_validate(values)
+
+    def from_row(self, row: Any) -> BaseModel:
+        return self.build({a: getattr(row, a) for a in self.attributes})
+
+    def from_rows(self, rows: Iterable[Any]) -> list[BaseModel]:
+        return [self.from_row(row) for row in rows]
@@ -0,0 +1,99 @@
+"""JWT signing/verification keys, parsed once.
+
+PyJWT accepts `cryptography` key objects directly; passing those instead of
+PEM strings skips re-parsing the key on every `encode`/`decode`.
+
+The signing key is identified by a `kid` header. Public keys of retired
+signing keys stay in the ring (`APP_JWT_RETIRED_PUBLIC_KEYS`, kid -> PEM)
+so tokens issued before a rotation keep verifying until they expire.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+SUPPORTED_ALGORITHMS = ("RS256", "ES256", "EdDSA")
+
+# Key id assumed for tokens issued before `kid` headers were added
+LEGACY_KID = "default"
+
+
+def _pem(value: str) -> bytes:
+    # Keys from env files usually carry escaped newlines
+    return value.replace("\\n", "\n").encode()
+
+
+def algorithm_for(public_key: Any) -> str:
+    """The algorithm a key is used with, derived from its type."""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256"
+    if isinstance(public_key, ec.EllipticCurvePublicKey) and isinstance(
+        public_key.curve, ec.SECP256R1
+    ):
+        return "ES256"
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return "EdDSA"
+    raise ValueError(f"Unsupported JWT key type: {type(public_key).__name__}")
+
+
+@dataclass(frozen=True)
+class VerifyKey:
+    key: Any
+    algorithm: str
+
+
+class JWTKeyRing:
+    def __init__(
+        self,
+        kid: str,
+        private_pem: str,
+        public_pem: str,
+        algorithm: str,
+        retired_public_pems: Mapping[str, str] | None = None,
+    ):
+        if algorithm not in SUPPORTED_ALGORITHMS:
+            raise ValueError(
+                f"JWT algorithm must be one of {SUPPORTED_ALGORITHMS}, got {algorithm}"
+            )
+
+        self.kid = kid
+        self.algorithm = algorithm
+        self.private_key = serialization.load_pem_private_key(
+            _pem(private_pem), password=None
+        )
+        public_key = serialization.load_pem_public_key(_pem(public_pem))
+
+        if algorithm_for(public_key) != algorithm:
+            raise ValueError(f"JWT key {kid!r} is not a {algorithm} key")
+
+        self.verify_keys: Dict[str, VerifyKey] = {}
+        for old_kid, pem in (retired_public_pems or {}).items():
+            old_key = serialization.load_pem_public_key(_pem(pem))
+            self.verify_keys[old_kid] = VerifyKey(old_key, algorithm_for(old_key))
+        self.verify_keys[kid] = VerifyKey(public_key, algorithm)
+
+    def encode(self, payload: Dict[str, Any]) -> str:
+        return jwt.encode(
+            payload,
+            self.private_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.kid},
+        )
+
+    def decode(self, token: str, **options: Any) -> Dict[str, Any]:
+        """Verify `token` with the key named by its `kid`.
+
+        Tokens without a `kid` (issued before key ids existed) are checked
+        against the `LEGACY_KID` key, so keep the original key under that id
+        when rotating. Only the key's own algorithm is accepted.
+        Raises `jwt.PyJWTError` on any failure.
+        """
+        kid = jwt.get_unverified_header(token).get("kid", LEGACY_KID)
+        verify_key = self.verify_keys.get(kid)
+        if verify_key is None:
+            raise jwt.InvalidKeyError(f"Unknown key id {kid!r}")
+        return jwt.decode(
+            token, verify_key.key, algorithms=[verify_key.algorithm], **options
+        )
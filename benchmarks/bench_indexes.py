@@ -0,0 +1,243 @@
+"""Before/after plans and latencies for the declared index pack.
+
+Run from the repository root against a staging copy of the database:
+
+    python -m benchmarks.bench_indexes --runs 5
+
+For every hot query shape the script runs ``EXPLAIN (ANALYZE, BUFFERS)``
+twice: once with the supporting indexes dropped inside a transaction that is
+rolled back afterwards ("before"), and once with the indexes in place
+("after"). It prints the plan nodes and the median execution time of each.
+
+Dropping an index takes an ACCESS EXCLUSIVE lock on its table until the
+rollback, so do not point this at a database that serves traffic. Create the
+indexes first via ``/run-migration``.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.database.postgresql import dispose_engine, init_engine
+from app.models.main.categories import TblCategories
+from app.models.main.food import TblFoods
+from app.models.main.notifications import TblNotifications
+from app.models.main.orders import (
+    OrderStatus,
+    TblOrderItems,
+    TblOrders,
+    TblOrderStatusHistory,
+)
+
+
+@dataclass
+class QueryShape:
+    name: str
+    used_by: str
+    indexes: List[str]
+    build: Callable[[Dict], object]
+
+
+def _today() -> datetime:
+    return datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+QUERY_SHAPES = [
+    QueryShape(
+        "customer order page",
+        "OrderService.list_orders",
+        ["ix_tbl_orders_user_id_created_at"],
+        lambda p: select(TblOrders)
+        .where(TblOrders.user_id == p["user_id"])
+        .order_by(TblOrders.created_at.desc(), TblOrders.ord_id.desc())
+        .limit(11),
+    ),
+    QueryShape(
+        "customer order count",
+        "OrderService.list_orders",
+        ["ix_tbl_orders_user_id_created_at"],
+        lambda p: select(func.count(TblOrders.ord_id)).where(
+            TblOrders.user_id == p["user_id"]
+        ),
+    ),
+    QueryShape(
+        "order items (selectinload)",
+        "OrderService.get_order / list_orders",
+        ["ix_tbl_order_items_order_id"],
+        lambda p: select(TblOrderItems).where(
+            TblOrderItems.order_id.in_(p["order_ids"])
+        ),
+    ),
+    QueryShape(
+        "order status history",
+        "OrderService.track_order",
+        ["ix_tbl_order_status_history_order_id"],
+        lambda p: select(TblOrderStatusHistory).where(
+            TblOrderStatusHistory.order_id == p["order_ids"][0]
+        ),
+    ),
+    QueryShape(
+        "admin orders by status",
+        "OrderService.list_all_orders",
+        ["ix_tbl_orders_status_created_at"],
+        lambda p: select(TblOrders)
+        .where(TblOrders.status == OrderStatus.PENDING)
+        .order_by(TblOrders.created_at.desc())
+        .limit(10),
+    ),
+    QueryShape(
+        "partial-hour range edge",
+        "TblOrderRollupHourly.get_stats_in_range",
+        ["ix_tbl_orders_created_at"],
+        lambda p: select(
+            func.count(TblOrders.ord_id), func.sum(TblOrders.total_amount)
+        ).where(
+            TblOrders.created_at >= _today() - timedelta(minutes=30),
+            TblOrders.created_at < _today(),
+        ),
+    ),
+    QueryShape(
+        "recent orders",
+        "TblOrders.get_recent_orders",
+        ["ix_tbl_orders_created_at"],
+        lambda p: select(TblOrders).order_by(TblOrders.created_at.desc()).limit(5),
+    ),
+    QueryShape(
+        "admin notification feed",
+        "TblNotifications.get_notifications",
+        ["ix_tbl_notifications_user_id_created_at"],
+        lambda p: select(TblNotifications)
+        .where(TblNotifications.user_id.is_(None))
+        .order_by(TblNotifications.created_at.desc())
+        .limit(50),
+    ),
+    QueryShape(
+        "admin unread count",
+        "TblNotifications.get_unread_count",
+        ["ix_tbl_notifications_user_id_unread"],
+        lambda p: select(func.count(TblNotifications.notif_id)).where(
+            TblNotifications.is_read.is_(False), TblNotifications.user_id.is_(None)
+        ),
+    ),
+    QueryShape(
+        "foods of a category",
+        "FoodService.get_by_category",
+        ["ix_tbl_foods_category_id"],
+        lambda p: select(TblFoods).where(TblFoods.category_id == p["category_id"]),
+    ),
+    QueryShape(
+        "categories of a restaurant",
+        "CategoryService.get_by_restaurant",
+        ["ix_tbl_categories_restaurant_id"],
+        lambda p: select(TblCategories).where(
+            TblCategories.restaurant_id == p["restaurant_id"]
+        ),
+    ),
+]
+
+
+async def _sample_params(conn: AsyncConnection) -> Dict:
+    """Pick realistic (i.e. the busiest) keys for the parameterised shapes."""
+    user_id = await conn.scalar(
+        select(TblOrders.user_id)
+        .group_by(TblOrders.user_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    order_ids = (
+        await conn.execute(
+            select(TblOrders.ord_id)
+            .where(TblOrders.user_id == user_id)
+            .order_by(TblOrders.created_at.desc())
+            .limit(10)
+        )
+    ).scalars().all()
+    category_id = await conn.scalar(
+        select(TblFoods.category_id)
+        .group_by(TblFoods.category_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    restaurant_id = await conn.scalar(
+        select(TblCategories.restaurant_id)
+        .group_by(TblCategories.restaurant_id)
+        .order_by(func.count().desc())
+        .limit(1)
+    )
+    return {
+        "user_id": user_id or 0,
+        "order_ids": list(order_ids) or [0],
+        "category_id": category_id or 0,
+        "restaurant_id": restaurant_id or 0,
+    }
+
+
+def _plan_nodes(plan: Dict) -> List[str]:
+    node = plan["Node Type"]
+    if plan.get("Index Name"):
+        node += f" using {plan['Index Name']}"
+    nodes = [node]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+async def _explain(conn: AsyncConnection, sql: str, runs: int):
+    timings = []
+    plan = None
+    for _ in range(runs):
+        raw = await conn.scalar(
+            text("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql)
+        )
+        result = json.loads(raw) if isinstance(raw, str) else raw
+        plan = result[0]["Plan"]
+        timings.append(result[0]["Execution Time"])
+    return _plan_nodes(plan), statistics.median(timings)
+
+
+async def main(runs: int) -> None:
+    engine = init_engine()
+    try:
+        async with engine.connect() as conn:
+            params = await _sample_params(conn)
+            await conn.rollback()
+            print(f"Sample parameters: {params}\n")
+
+            for shape in QUERY_SHAPES:
+                sql = str(
+                    shape.build(params).compile(
+                        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+                    )
+                )
+
+                async with conn.begin() as tx:
+                    for name in shape.indexes:
+                        await conn.execute(text(f'DROP INDEX IF EXISTS public."{name}"'))
+                    before_plan, before_ms = await _explain(conn, sql, runs)
+                    await tx.rollback()
+
+                async with conn.begin() as tx:
+                    after_plan, after_ms = await _explain(conn, sql, runs)
+                    await tx.rollback()
+
+                speedup = before_ms / after_ms if after_ms else float("inf")
+                print(f"== {shape.name} ({shape.used_by})")
+                print(f"   indexes: {', '.join(shape.indexes)}")
+                print(f"   before: {before_ms:9.3f} ms  {' > '.join(before_plan)}")
+                print(f"   after:  {after_ms:9.3f} ms  {' > '.join(after_plan)}")
+                print(f"   speedup: {speedup:.1f}x\n")
+    finally:
+        await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="EXPLAIN runs per plan")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs))
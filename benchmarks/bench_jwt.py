@@ -0,0 +1,106 @@
+"""Per-token JWT sign and verify cost for each supported algorithm.
+
+Run from the repository root (no database or Redis needed):
+
+    python -m benchmarks.bench_jwt --tokens 2000
+
+For RS256, ES256 and EdDSA a throwaway key pair is generated, and an
+access-token-shaped payload is signed and verified `--tokens` times through
+`JWTKeyRing` (key objects parsed once). The "pem" rows pass the PEM strings
+to PyJWT instead, which re-parses the key on every call, as `JWTService`
+used to.
+"""
+import argparse
+import time
+import uuid
+from typing import Callable, Tuple
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from app.utils.jwt_keys import JWTKeyRing
+
+KEY_FACTORIES = {
+    "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate,
+}
+
+
+def _pems(algorithm: str) -> Tuple[str, str]:
+    private_key = KEY_FACTORIES[algorithm]()
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def _payload() -> dict:
+    now = int(time.time())
+    return {
+        "uuid": str(uuid.uuid4()),
+        "role": "CUSTOMER",
+        "iss": "bench",
+        "aud": "api",
+        "iat": now,
+        "exp": now + 900,
+        "jti": uuid.uuid4().hex,
+    }
+
+
+def _per_token_us(fn: Callable[[], object], tokens: int) -> float:
+    start = time.perf_counter()
+    for _ in range(tokens):
+        fn()
+    return (time.perf_counter() - start) / tokens * 1_000_000
+
+
+def main(tokens: int) -> None:
+    payload = _payload()
+    print(f"{'algorithm':<12}{'sign µs':>12}{'verify µs':>12}{'token bytes':>14}")
+
+    for algorithm in KEY_FACTORIES:
+        private_pem, public_pem = _pems(algorithm)
+        ring = JWTKeyRing("bench", private_pem, public_pem, algorithm)
+        token = ring.encode(payload)
+
+        sign = _per_token_us(lambda: ring.encode(payload), tokens)
+        verify = _per_token_us(
+            lambda: ring.decode(token, issuer="bench", audience="api"), tokens
+        )
+        print(f"{algorithm:<12}{sign:>12.1f}{verify:>12.1f}{len(token):>14}")
+
+        pem_sign = _per_token_us(
+            lambda: jwt.encode(payload, private_pem, algorithm=algorithm), tokens
+        )
+        pem_verify = _per_token_us(
+            lambda: jwt.decode(
+                token,
+                public_pem,
+                algorithms=[algorithm],
+                issuer="bench",
+                audience="api",
+            ),
+            tokens,
+        )
+        print(f"{algorithm + ' pem':<12}{pem_sign:>12.1f}{pem_verify:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--tokens", type=int, default=2000, help="tokens signed/verified per row"
+    )
+    args = parser.parse_args()
+    main(args.tokens)
@@ -0,0 +1,135 @@
+"""CPU cost of building a JSON response with `ResponseBuilder.build`.
+
+Run from the repository root (no database or Redis needed):
+
+    python -m benchmarks.bench_response --orders 50 --foods 200 --rounds 500
+
+Representative payloads are enveloped and serialized `--rounds` times: a
+`PaginatedOrderResponse` page of `--orders` orders with three lines each, a
+list of `--foods` `FoodResponse` items, and a data-less acknowledgement
+(status update, delete). The "encoder" column is the original path
+(`jsonable_encoder` to a dict tree, then `JSONResponse` re-serializing it
+with the stdlib `json`); "pydantic" is what `build` does now: one compiled
+pass over `data`, spliced into a cached envelope. Both must produce the
+same bytes.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.foods.schema import FoodResponse
+from app.api.orders.schema import (
+    OrderItemResponse,
+    OrderResponseModel,
+    PaginatedOrderResponse,
+)
+from app.core.error.error_types import ErrorType
+from app.core.error.message_codes import MessageCode
+from app.core.i18n.message_resolver import MessageResolver
+from app.core.response.base_schema import CustomResponse
+from app.core.response.response_builder import ResponseBuilder
+from app.core.response.status_mapper import get_http_status
+
+
+def _orders_page(orders: int) -> PaginatedOrderResponse:
+    now = datetime.now(timezone.utc)
+    return PaginatedOrderResponse(
+        total=orders * 10,
+        items=[
+            OrderResponseModel(
+                uuid=f"6f1c2a4e-0000-4000-8000-{i:012d}",
+                user_id=1000 + i,
+                user_name=f"customer_{i}",
+                total_amount=round(12.5 * (i % 7 + 1), 2),
+                status="DELIVERED",
+                created_at=now - timedelta(minutes=i),
+                items=[
+                    OrderItemResponse(
+                        food_id=line,
+                        food_name=f"Dish number {line}",
+                        category_id=line % 4,
+                        quantity=line,
+                        price=4.25 * line,
+                    )
+                    for line in range(1, 4)
+                ],
+            )
+            for i in range(orders)
+        ],
+        next_cursor="MjAyNC0wMS0wMVQwMDowMDowMHwxMjM0",
+    )
+
+
+def _foods(foods: int) -> list[FoodResponse]:
+    return [
+        FoodResponse(
+            food_id=i,
+            name=f"Menu item {i}",
+            price=3.5 + i % 20,
+            category_id=i % 8,
+            is_available=i % 5 != 0,
+            image_digest=f"{i:064x}",
+        )
+        for i in range(foods)
+    ]
+
+
+def _encoder_build(error_type, message_code, lang="en", data=None) -> bytes:
+    """`ResponseBuilder.build` as it was: two passes over the payload."""
+    status_code = get_http_status(error_type)
+    response = CustomResponse(
+        status=1 if status_code < 400 else -1,
+        error_type=error_type,
+        message=MessageResolver.resolve(message_code, lang),
+        status_code=status_code,
+        data=data,
+    )
+    return JSONResponse(
+        status_code=status_code, content=jsonable_encoder(response)
+    ).body
+
+
+def _per_request_us(fn: Callable[[], object], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1_000_000
+
+
+def main(orders: int, foods: int, rounds: int) -> None:
+    payloads = {
+        f"orders x{orders}": (MessageCode.ORDERS_FETCHED, _orders_page(orders)),
+        f"foods x{foods}": (MessageCode.PROFILE_FETCHED, _foods(foods)),
+        "ack": (MessageCode.ORDER_STATUS_UPDATED, None),
+    }
+    print(
+        f"{'payload':<14}{'encoder µs':>12}{'pydantic µs':>13}"
+        f"{'saved':>8}{'bytes':>9}"
+    )
+
+    for name, (message_code, data) in payloads.items():
+        args = (ErrorType.SUC_200_OK, message_code, "en", data)
+        body = ResponseBuilder.build(*args).body
+        assert body == _encoder_build(*args), f"{name}: output differs"
+
+        old = _per_request_us(lambda: _encoder_build(*args), rounds)
+        new = _per_request_us(lambda: ResponseBuilder.build(*args), rounds)
+        print(
+            f"{name:<14}{old:>12.1f}{new:>13.1f}"
+            f"{1 - new / old:>8.0%}{len(body):>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=50, help="orders per page")
+    parser.add_argument("--foods", type=int, default=200, help="foods in the list")
+    parser.add_argument(
+        "--rounds", type=int, default=500, help="responses built per row"
+    )
+    args = parser.parse_args()
+    main(args.orders, args.foods, args.rounds)